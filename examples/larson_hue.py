@@ -2,7 +2,6 @@
 
 import math
 import time
-import colorsys
 import sys
 
 import plasma
@@ -55,9 +54,7 @@ while True:
         xhue %= 360             # Clamp to 0-359
         xhue /= 360.0           # Convert to 0.0 to 1.0
 
-        r, g, b = [int(c * 255) for c in colorsys.hsv_to_rgb(xhue, sat, val)]
-
-        plasma.set_pixel(x, r, g, b, val)
+        plasma.set_pixel_hsv(x, xhue, sat, val, val)
 
     plasma.show()
 
@@ -1,6 +1,5 @@
 #!/usr/bin/env python
 
-import colorsys
 import time
 import sys
 
@@ -39,11 +38,8 @@ hue = 0
 
 while True:
     hue = int(time.time() * 100) % 360
-    for x in range(plasma.get_pixel_count()):
-        offset = x * spacing
-        h = ((hue + offset) % 360) / 360.0
-        r, g, b = [int(c * 255) for c in colorsys.hsv_to_rgb(h, 1.0, 1.0)]
-        plasma.set_pixel(x, r, g, b)
+    hues = [((hue + x * spacing) % 360) / 360.0 for x in range(plasma.get_pixel_count())]
+    plasma.set_pixels_hsv(hues)
 
     plasma.show()
     time.sleep(0.001)
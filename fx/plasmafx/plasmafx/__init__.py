@@ -1,6 +1,7 @@
 import time
 
 ELEMENT_LED_COUNT = 4
+ELEMENT_SIZE = ELEMENT_LED_COUNT * 3
 
 class Plugin(object):
     """PlasmaFX Plugin.
@@ -12,6 +13,58 @@ class Plugin(object):
     def get_values(self):
         return
 
+    def render_into(self, buffer, offset, delta):
+        """Write RGB values for this element into buffer.
+
+        Fills buffer[offset:offset + ELEMENT_SIZE]. The default falls
+        back to get_values, plugins can override it to write without
+        building a list.
+
+        """
+        buffer[offset:offset + ELEMENT_SIZE] = bytearray(self.get_values(delta))
+
+    @classmethod
+    def render_batch(cls, plugins, buffer, indices, delta):
+        """Write RGB values for every element using this plugin class.
+
+        Called once per frame with all of a sequence's plugins of this
+        class and the element index of each. The default calls render_into
+        for each plugin in turn, plugins can override it to compute the
+        whole block at once and write it with write_block.
+
+        """
+        for plugin, index in zip(plugins, indices):
+            plugin.render_into(buffer, index * ELEMENT_SIZE, delta)
+
+
+def write_block(buffer, indices, block):
+    """Copy a block of element colours into a frame buffer.
+
+    :param buffer: Flat RGB frame buffer, a bytearray or NumPy array
+    :param indices: Element index for each row of the block
+    :param block: ELEMENT_SIZE bytes per index, bytes-like or a NumPy array
+
+    """
+    count = len(indices)
+    if hasattr(buffer, 'reshape'):
+        import numpy
+        if not hasattr(block, 'reshape') or isinstance(block, memoryview):
+            block = numpy.frombuffer(bytes(block), dtype=numpy.uint8)
+        elements = buffer[:len(buffer) // ELEMENT_SIZE * ELEMENT_SIZE].reshape(-1, ELEMENT_SIZE)
+        elements[indices] = block.reshape(count, ELEMENT_SIZE)
+        return
+
+    if hasattr(block, 'tobytes') and not isinstance(block, memoryview):
+        block = block.tobytes()
+    first = indices[0] if count else 0
+    if count and indices[-1] - first == count - 1 and list(indices) == list(range(first, first + count)):
+        buffer[first * ELEMENT_SIZE:(first + count) * ELEMENT_SIZE] = block
+        return
+
+    block = memoryview(block)
+    for x, index in enumerate(indices):
+        buffer[index * ELEMENT_SIZE:(index + 1) * ELEMENT_SIZE] = block[x * ELEMENT_SIZE:(x + 1) * ELEMENT_SIZE]
+
 class Sequence(object):
     """PlasmaFX Sequence.
 
@@ -22,16 +75,49 @@ class Sequence(object):
     def __init__(self, element_count):
         self.element_count = element_count
         self.elements = [None for x in range(element_count)]
+        self._batches = []
+        self._batched = []
 
     def set_plugin(self, element_index, plugin):
         self.elements[element_index] = plugin
 
+    def new_buffer(self):
+        """Return a blank RGB buffer sized for this sequence."""
+        return bytearray(self.element_count * ELEMENT_SIZE)
+
+    def get_batches(self):
+        """Return (plugin class, plugins, element indices) for each plugin class in use."""
+        if self._batched != self.elements:
+            batches = {}
+            for index, element in enumerate(self.elements):
+                if element is not None:
+                    plugins, indices = batches.setdefault(type(element), ([], []))
+                    plugins.append(element)
+                    indices.append(index)
+            self._batches = [(cls, plugins, indices) for cls, (plugins, indices) in batches.items()]
+            self._batched = list(self.elements)
+        return self._batches
+
+    def render_into(self, buffer, delta=None):
+        """Render a frame into a preallocated RGB buffer.
+
+        The buffer may be a bytearray, or a contiguous NumPy uint8 array of
+        shape (N * 3,) or (N, 3), and can be passed straight to
+        Plasma.set_from_array. Elements with no plugin are left untouched.
+
+        :param buffer: Buffer of at least element_count * ELEMENT_SIZE bytes
+        :param delta: Time to render, defaults to now
+
+        """
+        if delta is None:
+            delta = time.time()
+        flat = buffer.reshape(-1) if hasattr(buffer, 'reshape') else buffer
+        for cls, plugins, indices in self.get_batches():
+            cls.render_batch(plugins, flat, indices, delta)
+        return buffer
+
     def get_raw(self):
-        delta = time.time()
-        values = []
-        for element in range(self.element_count):
-            values += self.elements[element].get_values(delta)
-        return values
+        return list(self.render_into(self.new_buffer()))
 
     def get_leds(self):
         values = []
@@ -39,3 +125,128 @@ class Sequence(object):
         for x in range(0, self.element_count * ELEMENT_LED_COUNT * 3, 3):
             values.append(tuple(raw_values[x:x+3]))
         return values
+
+
+BLEND_MODES = ('alpha', 'add', 'multiply', 'screen', 'max')
+
+
+class Layer(Sequence):
+    """PlasmaFX Layer.
+
+    A sequence stacked on top of a Compositor, blended with the
+    layers below it. Elements with no plugin are transparent.
+
+    """
+    def __init__(self, element_count, mode='alpha', opacity=1.0):
+        Sequence.__init__(self, element_count)
+        self.set_mode(mode)
+        self.set_opacity(opacity)
+
+    def set_mode(self, mode):
+        if mode not in BLEND_MODES:
+            raise ValueError('Blend mode should be one of: {}'.format(', '.join(BLEND_MODES)))
+        self.mode = mode
+
+    def set_opacity(self, opacity):
+        self.opacity = max(0.0, min(1.0, float(opacity)))
+
+
+class Compositor(Sequence):
+    """PlasmaFX Compositor.
+
+    A sequence with further layers of plugins blended over it. Its own
+    plugins form the opaque base layer.
+
+    Blending is done for the whole frame at once with NumPy when it
+    is installed.
+
+    """
+    def __init__(self, element_count):
+        Sequence.__init__(self, element_count)
+        self.layers = []
+        self._scratch = None
+
+    def add_layer(self, mode='alpha', opacity=1.0):
+        """Add a layer on top of the existing layers and return it.
+
+        :param mode: Blend mode, one of BLEND_MODES
+        :param opacity: Layer opacity: 0.0 to 1.0
+
+        """
+        layer = Layer(self.element_count, mode, opacity)
+        self.layers.append(layer)
+        return layer
+
+    def render_into(self, buffer, delta=None):
+        if delta is None:
+            delta = time.time()
+
+        try:
+            import numpy
+        except ImportError:
+            return self._render_python(buffer, delta)
+
+        size = self.element_count * ELEMENT_SIZE
+        if self._scratch is None or len(self._scratch) != size:
+            self._scratch = numpy.zeros(size, dtype=numpy.uint8)
+        scratch = self._scratch
+
+        scratch[:] = 0
+        Sequence.render_into(self, scratch, delta)
+        frame = scratch.astype(numpy.float64)
+
+        for layer in self.layers:
+            if not layer.opacity:
+                continue
+            covered = [index for _, _, indices in layer.get_batches() for index in indices]
+            if not covered:
+                continue
+            layer.render_into(scratch, delta)
+            source = scratch.astype(numpy.float64)
+
+            if layer.mode == 'add':
+                source = numpy.minimum(frame + source, 255.0)
+            elif layer.mode == 'multiply':
+                source = frame * source / 255.0
+            elif layer.mode == 'screen':
+                source = 255.0 - (255.0 - frame) * (255.0 - source) / 255.0
+            elif layer.mode == 'max':
+                source = numpy.maximum(frame, source)
+
+            opacity = numpy.zeros(self.element_count)
+            opacity[covered] = layer.opacity
+            frame = numpy.floor(frame + (source - frame) * numpy.repeat(opacity, ELEMENT_SIZE) + 0.5)
+
+        flat = buffer.reshape(-1) if hasattr(buffer, 'reshape') else buffer
+        result = numpy.clip(frame, 0, 255).astype(numpy.uint8)
+        if hasattr(flat, 'reshape'):
+            flat[:size] = result
+        else:
+            flat[:size] = result.tobytes()
+        return buffer
+
+    def _render_python(self, buffer, delta):
+        frame = Sequence.render_into(self, self.new_buffer(), delta)
+        for layer in self.layers:
+            if not layer.opacity:
+                continue
+            source = layer.render_into(self.new_buffer(), delta)
+            for _, _, indices in layer.get_batches():
+                for index in indices:
+                    for x in range(index * ELEMENT_SIZE, (index + 1) * ELEMENT_SIZE):
+                        frame[x] = _blend(layer.mode, layer.opacity, frame[x], source[x])
+        flat = buffer.reshape(-1) if hasattr(buffer, 'reshape') else buffer
+        flat[:len(frame)] = frame
+        return buffer
+
+
+def _blend(mode, opacity, dst, src):
+    if mode == 'add':
+        src = min(dst + src, 255)
+    elif mode == 'multiply':
+        src = dst * src / 255.0
+    elif mode == 'screen':
+        src = 255 - (255 - dst) * (255 - src) / 255.0
+    elif mode == 'max':
+        src = max(dst, src)
+    return int(dst + (src - dst) * opacity + 0.5)
@@ -1,12 +1,241 @@
-import pkg_resources
-from plasmafx import Plugin
+import hashlib
+import importlib
+import json
+import os
+import sys
+from plasmafx import Plugin, ELEMENT_LED_COUNT, ELEMENT_SIZE, write_block
 
-plasma_fx_plugins = {}
+ENTRY_POINT_GROUP = 'plasmafx.effect_plugins'
+CACHE_FILE = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.expanduser(os.path.join('~', '.cache')),
+    'plasmafx', 'plugins.json')
 
-for entry_point in pkg_resources.iter_entry_points('plasmafx.effect_plugins'):
-    effect_handle = entry_point.name
-    plasma_fx_plugins[effect_handle] =  entry_point.load()
-    globals()['FX{}'.format(effect_handle)] = entry_point.load()
+# Effect handle to "module:attr", and effect handle to plugin class once imported
+_index = None
+_loaded = {}
+
+
+def _get_signature():
+    """Hash the distribution metadata names and mtimes on the import path.
+
+    The hash changes whenever a distribution is installed, upgraded,
+    reinstalled in place or removed, without reading any metadata.
+
+    """
+    signature = hashlib.sha1()
+    for path in sys.path:
+        try:
+            names = os.listdir(path or '.')
+        except OSError:
+            continue
+        signature.update(path.encode('utf-8'))
+        for name in sorted(names):
+            if name.endswith(('.dist-info', '.egg-info', '.egg-link', '.egg', '.pth')):
+                entry = os.path.join(path or '.', name)
+                # Entry points can be rewritten in place without touching their directory
+                for filename in (entry, os.path.join(entry, 'entry_points.txt')):
+                    try:
+                        mtime = os.stat(filename).st_mtime
+                    except OSError:
+                        continue
+                    signature.update('{}:{!r}'.format(filename, mtime).encode('utf-8'))
+    return signature.hexdigest()
+
+
+def _scan():
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        import pkg_resources
+        return {entry_point.name: '{}:{}'.format(entry_point.module_name, '.'.join(entry_point.attrs))
+                for entry_point in pkg_resources.iter_entry_points(ENTRY_POINT_GROUP)}
+
+    found = entry_points()
+    if hasattr(found, 'select'):
+        found = found.select(group=ENTRY_POINT_GROUP)
+    else:
+        found = found.get(ENTRY_POINT_GROUP, [])
+    return {entry_point.name: entry_point.value for entry_point in found}
+
+
+def get_index():
+    """Return a dict of installed effect handles to "module:attr" entry points.
+
+    Entry points are only scanned when the installed distributions have
+    changed since the index was last cached in CACHE_FILE.
+
+    """
+    global _index
+    if _index is not None:
+        return _index
+
+    signature = _get_signature()
+    try:
+        with open(CACHE_FILE) as f:
+            cache = json.load(f)
+        if cache['signature'] == signature:
+            _index = cache['plugins']
+    except (IOError, OSError, ValueError, KeyError, TypeError):
+        pass
+
+    if _index is None:
+        _index = _scan()
+        try:
+            if not os.path.isdir(os.path.dirname(CACHE_FILE)):
+                os.makedirs(os.path.dirname(CACHE_FILE))
+            with open(CACHE_FILE, 'w') as f:
+                json.dump({'signature': signature, 'plugins': _index}, f)
+        except (IOError, OSError):
+            pass
+
+    return _index
+
+
+def load_plugin(effect_handle):
+    """Import and return the plugin class for an installed effect."""
+    if effect_handle not in _loaded:
+        module_name, _, attrs = get_index()[effect_handle].split('[')[0].partition(':')
+        plugin = importlib.import_module(module_name.strip())
+        for attr in attrs.strip().split('.'):
+            if attr:
+                plugin = getattr(plugin, attr)
+        _loaded[effect_handle] = plugin
+    return _loaded[effect_handle]
+
+
+def __getattr__(name):
+    # Installed effects are only imported when first used, as FX<handle>
+    if name == 'plasma_fx_plugins':
+        return {effect_handle: load_plugin(effect_handle) for effect_handle in get_index()}
+    if name.startswith('FX') and name[2:] in get_index():
+        plugin = load_plugin(name[2:])
+        globals()[name] = plugin
+        return plugin
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+
+def __dir__():
+    return sorted(list(globals()) + ['plasma_fx_plugins'] + ['FX{}'.format(handle) for handle in get_index()])
+
+
+if sys.version_info < (3, 7):
+    # No module __getattr__, so load every effect up front
+    plasma_fx_plugins = __getattr__('plasma_fx_plugins')
+    for effect_handle, plugin in plasma_fx_plugins.items():
+        globals()['FX{}'.format(effect_handle)] = plugin
+
+
+EASINGS = {
+    'linear': lambda t: t,
+    'step': lambda t: 0.0,
+    'ease-in': lambda t: t * t,
+    'ease-out': lambda t: t * (2.0 - t),
+    'ease-in-out': lambda t: t * t * (3.0 - 2.0 * t)
+}
+
+
+class GradientTable(object):
+    """Colour table precomputed across a list of colour stops.
+
+    Stops are evenly spaced and the table wraps from the last stop back to
+    the first, matching Pulse. One table can be shared by any number of
+    Gradient plugins.
+
+    :param stops: List of (r, g, b) colours
+    :param size: Number of table entries
+    :param easing: Name from EASINGS, or a function mapping 0.0-1.0 to 0.0-1.0
+
+    """
+    def __init__(self, stops, size=256, easing='linear'):
+        ease = EASINGS[easing] if not callable(easing) else easing
+        length = len(stops)
+        self.size = size
+        self.table = bytearray(size * 3)
+        for x in range(size):
+            colour = length * x / float(size)
+            first = stops[int(colour) % length]
+            second = stops[(int(colour) + 1) % length]
+            blend = ease(colour - int(colour))
+            self.table[x * 3:x * 3 + 3] = bytearray(
+                max(0, min(255, int((second[c] - first[c]) * blend + first[c]))) for c in range(3))
+        # Each entry repeated for a whole element, for gradients with no spread
+        self._elements = [bytes(self.table[x * 3:x * 3 + 3] * ELEMENT_LED_COUNT) for x in range(size)]
+        self._array = None
+
+    def get_index(self, phase):
+        return int(phase * self.size) % self.size
+
+    def get_colour(self, phase):
+        index = self.get_index(phase) * 3
+        return tuple(self.table[index:index + 3])
+
+    def get_array(self):
+        """Return the table as a (size, 3) NumPy array."""
+        if self._array is None:
+            import numpy
+            self._array = numpy.frombuffer(bytes(self.table), dtype=numpy.uint8).reshape(self.size, 3)
+        return self._array
+
+
+class Gradient(Plugin):
+    """Cycle through a precomputed gradient by table lookup.
+
+    :param stops: List of (r, g, b) colours, or a shared GradientTable
+    :param speed: Seconds for one cycle through the gradient
+    :param phase: Offset into the cycle for this element: 0.0 to 1.0
+    :param spread: Phase difference between each light on the element
+    :param size: Number of table entries, when building a table from stops
+    :param easing: Easing between stops, when building a table from stops
+
+    """
+    def __init__(self, stops, speed=1, phase=0.0, spread=0.0, size=256, easing='linear'):
+        if not isinstance(stops, GradientTable):
+            stops = GradientTable(stops, size, easing)
+        self.table = stops
+        self.speed = speed
+        self.phase = phase
+        self.spread = spread
+
+    def get_phase(self, delta):
+        return (delta % self.speed) / float(self.speed) + self.phase
+
+    def get_values(self, delta):
+        phase = self.get_phase(delta)
+        values = []
+        for x in range(ELEMENT_LED_COUNT):
+            values += self.table.get_colour(phase + x * self.spread)
+        return values
+
+    def render_into(self, buffer, offset, delta):
+        phase = self.get_phase(delta)
+        if not self.spread:
+            buffer[offset:offset + ELEMENT_SIZE] = self.table._elements[self.table.get_index(phase)]
+            return
+        table = self.table.table
+        for x in range(ELEMENT_LED_COUNT):
+            index = self.table.get_index(phase + x * self.spread) * 3
+            buffer[offset + x * 3:offset + x * 3 + 3] = table[index:index + 3]
+
+    @classmethod
+    def render_batch(cls, plugins, buffer, indices, delta):
+        try:
+            import numpy
+        except ImportError:
+            return super(Gradient, cls).render_batch(plugins, buffer, indices, delta)
+
+        tables = {}
+        for plugin, index in zip(plugins, indices):
+            group = tables.setdefault(id(plugin.table), (plugin.table, [], []))
+            group[1].append(plugin)
+            group[2].append(index)
+
+        leds = numpy.arange(ELEMENT_LED_COUNT)
+        for table, group, group_indices in tables.values():
+            params = numpy.array([(p.speed, p.phase, p.spread) for p in group], dtype=numpy.float64)
+            speed, phase, spread = [column[:, None] for column in params.T]
+            phase = (delta % speed) / speed + phase + leds * spread
+            lookup = (phase * table.size).astype(numpy.int64) % table.size
+            write_block(buffer, group_indices, table.get_array()[lookup].reshape(len(group), -1))
 
 
 class Solid(Plugin):
@@ -17,10 +246,14 @@ class Solid(Plugin):
         self.r = r
         self.g = g
         self.b = b
+        self._values = bytearray([r, g, b] * ELEMENT_LED_COUNT)
 
     def get_values(self, delta):
         return [self.r, self.g, self.b] * 4
 
+    def render_into(self, buffer, offset, delta):
+        buffer[offset:offset + ELEMENT_SIZE] = self._values
+
 
 class Pulse(Plugin):
     def __init__(self, sequence, speed=1):
@@ -35,15 +268,20 @@ class Pulse(Plugin):
         result += self.c(first, channel)
         return int(result)
 
-    def get_values(self, delta):
+    def get_colour(self, delta):
         length = len(self.sequence)
         position = (delta % self.speed) / float(self.speed)
         colour = length * position
-        blend = colour - int(colour)
+        blend = float(colour - int(colour))
         first_colour = int(colour) % length
         second_colour = (first_colour + 1) % length
 
-        r = self.blend(0, first_colour, second_colour, blend)
-        g = self.blend(1, first_colour, second_colour, blend)
-        b = self.blend(2, first_colour, second_colour, blend)
-        return [r, g, b] * 4
+        first = self.sequence[first_colour]
+        second = self.sequence[second_colour]
+        return tuple(int((second[x] - first[x]) * blend + first[x]) for x in range(3))
+
+    def get_values(self, delta):
+        return list(self.get_colour(delta)) * 4
+
+    def render_into(self, buffer, offset, delta):
+        buffer[offset:offset + ELEMENT_SIZE] = bytearray(self.get_colour(delta)) * ELEMENT_LED_COUNT
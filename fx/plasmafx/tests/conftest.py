@@ -0,0 +1,6 @@
+# noqa D100
+import os
+import sys
+
+# Test the plasmafx package from this checkout
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
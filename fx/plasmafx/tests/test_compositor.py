@@ -0,0 +1,66 @@
+"""Test layering sequences with blend modes."""
+import pytest
+
+BASE = (100, 50, 200)
+TOP = (200, 100, 50)
+
+
+def _compositor(mode, opacity=1.0):
+    import plasmafx
+    from plasmafx import plugins
+    compositor = plasmafx.Compositor(2)
+    compositor.set_plugin(0, plugins.Solid(*BASE))
+    compositor.set_plugin(1, plugins.Solid(*BASE))
+    layer = compositor.add_layer(mode, opacity)
+    layer.set_plugin(0, plugins.Solid(*TOP))
+    return compositor
+
+
+@pytest.mark.parametrize('mode,expected', [
+    ('alpha', [200, 100, 50]),
+    ('add', [255, 150, 250]),
+    ('multiply', [78, 20, 39]),
+    ('screen', [222, 130, 211]),
+    ('max', [200, 100, 200])
+])
+def test_blend_modes(mode, expected):
+    """Test each blend mode, leaving elements without a layer plugin alone."""
+    compositor = _compositor(mode)
+    for buffer in (compositor.render_into(compositor.new_buffer(), 0),
+                   compositor._render_python(compositor.new_buffer(), 0)):
+        assert list(buffer[0:12]) == expected * 4
+        assert list(buffer[12:24]) == list(BASE) * 4
+
+
+def test_opacity():
+    """Test layer opacity mixes with the layers below."""
+    compositor = _compositor('alpha', 0.5)
+    assert compositor.get_raw()[0:3] == [150, 75, 125]
+
+    compositor.layers[0].set_opacity(0)
+    assert compositor.get_raw()[0:3] == list(BASE)
+
+    with pytest.raises(ValueError):
+        compositor.layers[0].set_mode('overlay')
+
+
+def test_numpy_parity():
+    """Test stacked layers blend the same with and without NumPy."""
+    numpy = pytest.importorskip('numpy')
+    import plasmafx
+    from plasmafx import plugins
+    compositor = plasmafx.Compositor(20)
+    for x in range(20):
+        compositor.set_plugin(x, plugins.Pulse([(10 * x, 0, 255), (0, 255, 5 * x)], speed=3))
+    for mode in plasmafx.BLEND_MODES:
+        layer = compositor.add_layer(mode, 0.6)
+        for x in range(0, 20, 3):
+            layer.set_plugin(x, plugins.Pulse([(200, 50, 0), (0, 90, 255)], speed=2))
+
+    for delta in (1.0, 3.3, 7.77):
+        expected = compositor._render_python(compositor.new_buffer(), delta)
+        assert compositor.render_into(compositor.new_buffer(), delta) == expected
+
+        buffer = numpy.zeros((80, 3), dtype=numpy.uint8)
+        compositor.render_into(buffer, delta)
+        assert buffer.tobytes() == bytes(expected)
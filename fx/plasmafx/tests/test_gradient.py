@@ -0,0 +1,58 @@
+"""Test the precomputed gradient plugin."""
+import pytest
+
+
+def test_table():
+    """Test the table wraps between stops and applies easing."""
+    from plasmafx.plugins import GradientTable
+    table = GradientTable([(0, 0, 0), (200, 100, 0)], size=4)
+    assert table.table == bytearray([0, 0, 0, 100, 50, 0, 200, 100, 0, 100, 50, 0])
+
+    eased = GradientTable([(0, 0, 0), (200, 100, 0)], size=4, easing='ease-in')
+    assert eased.get_colour(0.25) == (50, 25, 0)
+    assert GradientTable([(0, 0, 0), (200, 100, 0)], size=4, easing='step').get_colour(0.25) == (0, 0, 0)
+
+
+def test_get_values():
+    """Test phase offsets and spread look up the shared table."""
+    from plasmafx.plugins import Gradient, GradientTable
+    table = GradientTable([(0, 0, 0), (200, 100, 0)], size=4)
+    first = Gradient(table, speed=4)
+    second = Gradient(table, speed=4, phase=0.5, spread=0.25)
+
+    assert first.table is second.table
+    assert first.get_values(1.0) == [100, 50, 0] * 4
+    assert second.get_values(1.0) == [100, 50, 0, 0, 0, 0, 100, 50, 0, 200, 100, 0]
+
+
+def _sequence():
+    import plasmafx
+    from plasmafx.plugins import Gradient, GradientTable
+    table = GradientTable([(255, 0, 0), (0, 0, 255), (0, 0, 0)], size=64)
+    sequence = plasmafx.Sequence(6)
+    for x in range(5):
+        sequence.set_plugin(x, Gradient(table, speed=0.5, phase=x / 5.0, spread=0.1 * (x % 2)))
+    sequence.set_plugin(5, Gradient([(0, 0, 0), (255, 0, 255)], easing='ease-in-out'))
+    return sequence
+
+
+def test_render_parity():
+    """Test render_into and render_batch match get_values."""
+    from plasmafx.plugins import Gradient
+    sequence = _sequence()
+    for delta in (0.0, 1.23, 77.7):
+        expected = bytearray()
+        for element in sequence.elements:
+            expected += bytearray(element.get_values(delta))
+
+        buffer = sequence.new_buffer()
+        for x, element in enumerate(sequence.elements):
+            element.render_into(buffer, x * 12, delta)
+        assert buffer == expected
+
+        assert sequence.render_into(sequence.new_buffer(), delta) == expected
+
+        numpy = pytest.importorskip('numpy')
+        buffer = numpy.zeros((24, 3), dtype=numpy.uint8)
+        Gradient.render_batch(sequence.elements, buffer.reshape(-1), list(range(6)), delta)
+        assert buffer.tobytes() == bytes(expected)
@@ -0,0 +1,72 @@
+"""Test lazy, cached effect plugin discovery."""
+import json
+
+import pytest
+
+
+@pytest.fixture
+def plugins(tmpdir, monkeypatch):
+    """Point plasmafx.plugins at an empty cache and a stub entry point scan."""
+    from plasmafx import plugins
+    scans = []
+
+    def scan():
+        scans.append(True)
+        return {'Fake': 'plasmafx:Plugin'}
+
+    monkeypatch.setattr(plugins, 'CACHE_FILE', str(tmpdir.join('cache', 'plugins.json')))
+    monkeypatch.setattr(plugins, '_scan', scan)
+    monkeypatch.setattr(plugins, '_get_signature', lambda: 'one')
+    monkeypatch.setattr(plugins, '_index', None)
+    monkeypatch.setattr(plugins, '_loaded', {})
+    plugins.scans = scans
+    yield plugins
+    vars(plugins).pop('FXFake', None)
+    del plugins.scans
+
+
+def test_cache_hit(plugins):
+    """Test the index is cached on disk and reused."""
+    assert plugins.get_index() == {'Fake': 'plasmafx:Plugin'}
+    with open(plugins.CACHE_FILE) as f:
+        assert json.load(f) == {'signature': 'one', 'plugins': {'Fake': 'plasmafx:Plugin'}}
+
+    plugins._index = None
+    assert plugins.get_index() == {'Fake': 'plasmafx:Plugin'}
+    assert len(plugins.scans) == 1
+
+
+def test_cache_invalidated(plugins, monkeypatch):
+    """Test a changed signature rescans entry points."""
+    plugins.get_index()
+    plugins._index = None
+    monkeypatch.setattr(plugins, '_get_signature', lambda: 'two')
+    plugins.get_index()
+    assert len(plugins.scans) == 2
+
+
+def test_lazy_load(plugins):
+    """Test effects are only imported on first access."""
+    import plasmafx
+    assert 'FXFake' not in vars(plugins)
+    assert 'FXFake' in dir(plugins)
+
+    assert plugins.FXFake is plasmafx.Plugin
+    assert vars(plugins)['FXFake'] is plasmafx.Plugin
+    assert plugins.plasma_fx_plugins == {'Fake': plasmafx.Plugin}
+    with pytest.raises(AttributeError):
+        plugins.FXMissing
+
+
+def test_signature(tmpdir, monkeypatch):
+    """Test rewriting entry points in place changes the signature."""
+    import os
+    import sys
+    from plasmafx import plugins
+    info = tmpdir.mkdir('plasmafx_plugin_fake.egg-info')
+    info.join('entry_points.txt').write('[plasmafx.effect_plugins]\n')
+    monkeypatch.setattr(sys, 'path', [str(tmpdir)])
+    signature = plugins._get_signature()
+
+    os.utime(str(info.join('entry_points.txt')), (0, 0))
+    assert plugins._get_signature() != signature
@@ -0,0 +1,71 @@
+"""Test rendering sequences into frame buffers."""
+import pytest
+
+
+def _sequence():
+    import plasmafx
+    from plasmafx import plugins
+    sequence = plasmafx.Sequence(5)
+    sequence.set_plugin(0, plugins.Solid(1, 2, 3))
+    sequence.set_plugin(1, plugins.Pulse([(0, 0, 0), (255, 0, 255)], speed=2))
+    sequence.set_plugin(3, plugins.Solid(4, 5, 6))
+    sequence.set_plugin(4, plugins.Pulse([(255, 0, 0), (0, 0, 255)]))
+    return sequence
+
+
+def _expected(sequence, delta):
+    values = bytearray()
+    for element in sequence.elements:
+        values += bytearray(element.get_values(delta) if element is not None else [0] * 12)
+    return values
+
+
+def test_render_into():
+    """Test render_into matches get_values and leaves empty elements alone."""
+    sequence = _sequence()
+    buffer = sequence.render_into(sequence.new_buffer(), 0.75)
+
+    assert buffer == _expected(sequence, 0.75)
+    assert sequence.get_raw()[0:3] == [1, 2, 3]
+
+
+def test_render_into_numpy():
+    """Test flat and (N, 3) NumPy buffers match a bytearray."""
+    numpy = pytest.importorskip('numpy')
+    sequence = _sequence()
+    expected = _expected(sequence, 1.25)
+
+    for shape in ((60,), (20, 3)):
+        buffer = numpy.zeros(shape, dtype=numpy.uint8)
+        sequence.render_into(buffer, 1.25)
+        assert buffer.tobytes() == bytes(expected)
+
+
+def test_get_batches():
+    """Test elements are grouped by plugin class and regrouped on change."""
+    from plasmafx import plugins
+    sequence = _sequence()
+    batches = dict((cls, indices) for cls, _, indices in sequence.get_batches())
+    assert batches == {plugins.Solid: [0, 3], plugins.Pulse: [1, 4]}
+
+    sequence.set_plugin(2, plugins.Solid(7, 8, 9))
+    batches = dict((cls, indices) for cls, _, indices in sequence.get_batches())
+    assert batches[plugins.Solid] == [0, 2, 3]
+
+
+def test_write_block():
+    """Test blocks are scattered into bytearray and NumPy buffers."""
+    from plasmafx import write_block
+    block = bytearray(range(24))
+
+    for indices in ([1, 2], [0, 2]):
+        buffer = bytearray(36)
+        write_block(buffer, indices, block)
+        assert buffer[indices[0] * 12:indices[0] * 12 + 12] == block[0:12]
+        assert buffer[indices[1] * 12:indices[1] * 12 + 12] == block[12:24]
+
+    numpy = pytest.importorskip('numpy')
+    buffer = numpy.zeros(36, dtype=numpy.uint8)
+    write_block(buffer, [0, 2], numpy.arange(24, dtype=numpy.uint8).reshape(2, 12))
+    assert buffer[24:36].tobytes() == bytes(block[12:24])
+    assert not buffer[12:24].any()
@@ -1,4 +1,4 @@
-from plasmafx import Plugin
+from plasmafx import Plugin, ELEMENT_LED_COUNT, write_block
 from colorsys import hsv_to_rgb
 
 class Cycle(Plugin):
@@ -19,3 +19,35 @@ class Cycle(Plugin):
             r, g, b = [int(c * 255) for c in (r, g, b)]
             values += [r, g, b]
         return values
+
+    @classmethod
+    def render_batch(cls, plugins, buffer, indices, delta):
+        try:
+            import numpy
+        except ImportError:
+            return super(Cycle, cls).render_batch(plugins, buffer, indices, delta)
+
+        params = numpy.array([(p._speed, p._spread, p._offset, p._saturation, p._value) for p in plugins])
+        speed, spread, offset, s, v = [column[:, None] for column in params.T]
+        leds = numpy.arange(ELEMENT_LED_COUNT) / 100.0
+        h = (delta * speed / 10.0) + (leds * spread) + (offset / 360.0)
+
+        block = _hsv_to_rgb(numpy, h, s, v)
+        write_block(buffer, indices, block.reshape(len(plugins), -1))
+
+
+def _hsv_to_rgb(numpy, h, s, v):
+    """Vectorised colorsys.hsv_to_rgb, returning 0 to 255 uint8 values."""
+    h, s, v = numpy.broadcast_arrays(h, s, v)
+    i = numpy.floor(h * 6.0)
+    f = h * 6.0 - i
+    i = i.astype(numpy.int64) % 6
+    p = v * (1.0 - s)
+    q = v * (1.0 - s * f)
+    t = v * (1.0 - s * (1.0 - f))
+
+    result = numpy.empty(h.shape + (3,), dtype=numpy.uint8)
+    result[..., 0] = numpy.choose(i, [v, q, p, p, t, v]) * 255
+    result[..., 1] = numpy.choose(i, [t, v, v, q, p, p]) * 255
+    result[..., 2] = numpy.choose(i, [p, p, t, v, v, q]) * 255
+    return result
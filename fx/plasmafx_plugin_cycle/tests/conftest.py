@@ -0,0 +1,7 @@
+# noqa D100
+import os
+import sys
+
+# Test against plasmafx and this plugin from this checkout
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'plasmafx'))
@@ -0,0 +1,36 @@
+"""Test the colour cycle plugin."""
+import pytest
+
+
+def _plugins():
+    from plasmafx_plugin_cycle import Cycle
+    return [Cycle(speed=2, spread=5, offset=36.0 * x, saturation=0.5 + x / 20.0, value=1.0 - x / 20.0)
+            for x in range(10)]
+
+
+def test_render_batch():
+    """Test the vectorised batch matches get_values."""
+    pytest.importorskip('numpy')
+    from plasmafx_plugin_cycle import Cycle
+    plugins = _plugins()
+    indices = [0, 1, 2, 4, 5, 6, 7, 9, 10, 11]
+
+    for delta in (0.0, 1.5, 12345.678):
+        buffer = bytearray(12 * 12)
+        Cycle.render_batch(plugins, buffer, indices, delta)
+        for plugin, index in zip(plugins, indices):
+            assert list(buffer[index * 12:(index + 1) * 12]) == plugin.get_values(delta)
+
+
+def test_render_batch_numpy_buffer():
+    """Test the batch writes the same values into a NumPy buffer."""
+    numpy = pytest.importorskip('numpy')
+    from plasmafx_plugin_cycle import Cycle
+    plugins = _plugins()
+    buffer = numpy.zeros((40, 3), dtype=numpy.uint8)
+    Cycle.render_batch(plugins, buffer.reshape(-1), list(range(10)), 3.25)
+
+    expected = bytearray()
+    for plugin in plugins:
+        expected += bytearray(plugin.get_values(3.25))
+    assert buffer.tobytes() == bytes(expected)
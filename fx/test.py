@@ -1,12 +1,12 @@
-import plasma
 import plasmafx
 from plasmafx import plugins
 import time
+from plasma.gpio import PlasmaGPIO
 
 FPS = 60
 NUM_LIGHTS = 10
 
-plasma.set_light_count(10)
+plasma = PlasmaGPIO(NUM_LIGHTS, 14, 15)
 
 sequence = plasmafx.Sequence(NUM_LIGHTS)
 
@@ -28,11 +28,10 @@ sequence.set_plugin(1, plugins.Pulse([
         (0, 0, 0)
 ], speed=0.5))
 
-while True:
-    values = sequence.get_leds()
+buffer = sequence.new_buffer()
 
-    for index, rgb in enumerate(values):
-        # print("Setting pixel: {} to {}:{}:{}".format(index, *rgb))
-        plasma.set_pixel(index, *rgb)
+while True:
+    sequence.render_into(buffer)
+    plasma.set_from_array(buffer)
     plasma.show()
     time.sleep(1.0 / FPS)
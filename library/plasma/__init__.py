@@ -18,6 +18,10 @@ def get_device(descriptor):
 
     GPIO:14:15
 
+    Or hardware SPI, with an optional clock speed in Hz:
+
+    SPI:0:0:4000000
+
     And WS281X pixels as:
 
     WS281X:WS2812_RGB:13:1
@@ -27,6 +31,12 @@ def get_device(descriptor):
     if dsc[0] == "GPIO":
         from .gpio import PlasmaGPIO
         return PlasmaGPIO, {'gpio_data': int(dsc[1]), 'gpio_clock': int(dsc[2])}
+    if dsc[0] == "SPI":
+        from .spi import PlasmaSPI
+        args = {'bus': int(dsc[1]), 'device': int(dsc[2])}
+        if len(dsc) > 3:
+            args['max_speed_hz'] = int(dsc[3])
+        return PlasmaSPI, args
     if dsc[0] == "SERIAL":
         from .usb import PlasmaSerial
         return PlasmaSerial, {'port': dsc[1]}
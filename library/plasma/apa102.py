@@ -0,0 +1,79 @@
+SOF_LENGTH = 4
+# The small dark die APA102s need 36 clocks to latch, round up to whole bytes
+EOF_LENGTH = 5
+
+_BRIGHTNESS = bytes(bytearray(0b11100000 | (x & 0b11111) for x in range(256)))
+
+
+class APA102Encoder(object):
+    """Persistent APA102 frame.
+
+    Holds the start frame, one 0b111xxxxx, B, G, R word per pixel and the end
+    frame in a single bytearray, so only changed pixels need to be re-encoded
+    and any backend can send the result as-is.
+
+    """
+
+    def __init__(self, pixel_count):
+        self._pixel_count = pixel_count
+        self.frame = bytearray(SOF_LENGTH + pixel_count * 4 + EOF_LENGTH)
+        self.frame[SOF_LENGTH:SOF_LENGTH + pixel_count * 4:4] = bytearray([0b11100000]) * pixel_count
+
+    def get_pixel_count(self):
+        return self._pixel_count
+
+    def resize(self, pixel_count):
+        """Resize the frame in place, keeping the encoded pixels that remain.
+
+        :param pixel_count: Number of pixels
+
+        """
+        end = SOF_LENGTH + self._pixel_count * 4
+        if pixel_count > self._pixel_count:
+            words = bytearray(b'\xe0\x00\x00\x00') * (pixel_count - self._pixel_count)
+            self.frame[end:end] = words
+        else:
+            del self.frame[SOF_LENGTH + pixel_count * 4:end]
+        self._pixel_count = pixel_count
+
+    def get_pixel_data(self):
+        """Return a view of the pixel words, without start and end frames."""
+        return memoryview(self.frame)[SOF_LENGTH:SOF_LENGTH + self._pixel_count * 4]
+
+    def set_pixel(self, index, r, g, b, brightness):
+        """Encode a single pixel.
+
+        :param index: Index of the pixel
+        :param r: Amount of red: 0 to 255
+        :param g: Amount of green: 0 to 255
+        :param b: Amount of blue: 0 to 255
+        :param brightness: Raw brightness: 0 to 31
+
+        """
+        offset = SOF_LENGTH + index * 4
+        frame = self.frame
+        frame[offset] = 0b11100000 | (brightness & 0b11111)
+        frame[offset + 1] = b
+        frame[offset + 2] = g
+        frame[offset + 3] = r
+
+    def encode(self, pixels, start=0, stop=None):
+        """Encode a range of pixels from an r, g, b, brightness buffer.
+
+        :param pixels: Pixel buffer with four bytes per pixel: r, g, b, brightness
+        :param start: Index of the first pixel to encode
+        :param stop: Index one past the last pixel to encode (default all)
+
+        """
+        if stop is None:
+            stop = self._pixel_count
+        frame = self.frame
+        src_start = start * 4
+        src_stop = stop * 4
+        dst_start = SOF_LENGTH + src_start
+        dst_stop = SOF_LENGTH + src_stop
+        frame[dst_start:dst_stop:4] = pixels[src_start + 3:src_stop:4].translate(_BRIGHTNESS)
+        frame[dst_start + 1:dst_stop:4] = pixels[src_start + 2:src_stop:4]
+        frame[dst_start + 2:dst_stop:4] = pixels[src_start + 1:src_stop:4]
+        frame[dst_start + 3:dst_stop:4] = pixels[src_start:src_stop:4]
+        return frame
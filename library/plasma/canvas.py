@@ -0,0 +1,68 @@
+from .core import Plasma, PIXELS_PER_LIGHT, BYTES_PER_PIXEL
+
+
+class PlasmaCanvas(Plasma):
+    """A single pixel index space spanning several Plasma devices.
+
+    Each segment maps a run of the canvas' pixels, in order, onto a run of
+    pixels on one device, optionally reversed. Draw into the canvas as if
+    it were one long chain; show copies each changed segment into its
+    device with one bulk write and shows every device.
+
+    """
+
+    def __init__(self, segments, concurrent=True):
+        """Create a canvas.
+
+        :param segments: List of (device, offset, count, reverse) tuples, trailing items optional.
+            offset is the first pixel used on the device (default 0), count the number of
+            pixels (default the rest of the device) and reverse whether to run backwards.
+        :param concurrent: Output to every device at once, using their async writer threads
+
+        """
+        self._segments = []
+        self._devices = []
+        start = 0
+        for segment in segments:
+            segment = tuple(segment)
+            device, offset, count, reverse = (segment + (0, None, False)[len(segment) - 1:])[0:4]
+            if count is None:
+                count = device.get_pixel_count() - offset
+            if offset < 0 or count < 1 or offset + count > device.get_pixel_count():
+                raise ValueError('Segment does not fit on its device')
+            self._segments.append((device, start, start + count, offset, reverse))
+            if device not in self._devices:
+                self._devices.append(device)
+            start += count
+
+        if start % PIXELS_PER_LIGHT:
+            raise ValueError('Segments should add up to a whole number of lights')
+
+        if concurrent:
+            for device in self._devices:
+                device.set_async(True)
+
+        Plasma.__init__(self, start // PIXELS_PER_LIGHT)
+
+    def set_light_count(self, light_count):
+        raise TypeError('Change the segments of a canvas by creating a new one')
+
+    def get_devices(self):
+        return list(self._devices)
+
+    def _show(self, pixels, dirty):
+        for device, start, stop, offset, reverse in self._segments:
+            if dirty is None or (dirty[0] < stop and dirty[1] > start):
+                data = bytearray(pixels[start * BYTES_PER_PIXEL:stop * BYTES_PER_PIXEL])
+                if reverse:
+                    for channel in range(BYTES_PER_PIXEL):
+                        data[channel::BYTES_PER_PIXEL] = data[channel::BYTES_PER_PIXEL][::-1]
+                device.set_from_array(data, offset, channels=BYTES_PER_PIXEL)
+
+        for device in self._devices:
+            device.show()
+
+    def atexit(self):
+        Plasma.atexit(self)
+        for device in self._devices:
+            device.set_async(False)
@@ -0,0 +1,121 @@
+import json
+import socket
+import sys
+
+from .control import MAX_LINE_LENGTH
+
+SOCKET_FILE = '/tmp/plasma.sock'
+
+
+class ControlError(Exception):
+    """The Plasma daemon rejected a command."""
+
+
+class PlasmaClient(object):
+    """Client for the Plasma daemon control socket.
+
+    Commands are sent as newline terminated text and the daemon answers
+    each with one line, starting "ok" or "error". Any number of commands
+    can be sent in one batch with send.
+
+    """
+
+    def __init__(self, path=SOCKET_FILE, timeout=5.0):
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.settimeout(timeout)
+        self._socket.connect(path)
+        self._buffer = b''
+
+    def send(self, *commands):
+        """Send a batch of commands and return the daemon's reply to each.
+
+        :param commands: Command strings, eg: "fps 60", "light 0 255 0 0"
+
+        """
+        lines = [c.encode('utf-8') for c in commands]
+        # The daemon ignores these without replying, so waiting for a reply would hang
+        for line in lines:
+            if not line.strip() or b'\n' in line or len(line) > MAX_LINE_LENGTH:
+                raise ValueError('Commands should be a single, non-empty line')
+        self._socket.sendall(b''.join(line + b'\n' for line in lines))
+        return [self._readline() for _ in commands]
+
+    def command(self, command):
+        """Send a single command, returning its reply without the leading "ok".
+
+        Raises ControlError if the daemon reports an error.
+
+        :param command: Command string
+
+        """
+        reply = self.send(command)[0]
+        status, _, payload = reply.partition(' ')
+        if status != 'ok':
+            raise ControlError(payload)
+        return payload
+
+    def set_colour(self, r, g, b):
+        """Display a solid colour on every light."""
+        self.command('{} {} {}'.format(int(r), int(g), int(b)))
+
+    def set_lights(self, first, last, r, g, b):
+        """Set lights first to last (inclusive) to a colour."""
+        self.command('lights {} {} {} {} {}'.format(int(first), int(last), int(r), int(g), int(b)))
+
+    def set_pattern(self, name):
+        """Display a pattern from the daemon's pattern directory."""
+        self.command('pattern {}'.format(name))
+
+    def set_fps(self, fps):
+        """Set the daemon's framerate."""
+        self.command('fps {}'.format(int(fps)))
+
+    def get_status(self):
+        """Return a dictionary describing what the daemon is displaying."""
+        return json.loads(self.command('status'))
+
+    def get_stats(self):
+        """Return a dictionary of the daemon's frame timing statistics."""
+        return json.loads(self.command('stats'))
+
+    def stop(self):
+        """Stop the daemon."""
+        self.command('stop')
+
+    def close(self):
+        self._socket.close()
+
+    def _readline(self):
+        while b'\n' not in self._buffer:
+            data = self._socket.recv(4096)
+            if not data:
+                raise ControlError('Connection closed by daemon')
+            self._buffer += data
+        line, self._buffer = self._buffer.split(b'\n', 1)
+        return line.decode('utf-8')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, e_type, e_value, traceback):
+        self.close()
+
+
+def main(args):
+    """Send a command from the command line, printing the reply."""
+    try:
+        with PlasmaClient() as client:
+            reply = client.command(' '.join(args))
+    except ControlError as e:
+        sys.stderr.write('Error: {}\n'.format(e))
+        return 1
+    except socket.error as e:
+        sys.stderr.write('Unable to reach the Plasma daemon: {}\n'.format(e))
+        return 1
+    if reply:
+        print(reply)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
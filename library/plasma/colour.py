@@ -0,0 +1,92 @@
+import colorsys
+
+HUE_STEPS = 1536
+
+# Fully saturated, full value colour for each hue step, as floats and packed RGB bytes
+_HUE_LUT = [colorsys.hsv_to_rgb(x / float(HUE_STEPS), 1.0, 1.0) for x in range(HUE_STEPS)]
+_HUE_LUT_BYTES = [bytes(bytearray(int(c * 255) for c in rgb)) for rgb in _HUE_LUT]
+
+
+def hsv_to_rgb(h, s, v):
+    """Convert a single HSV colour to RGB.
+
+    :param h: Hue: 0.0 to 1.0
+    :param s: Saturation: 0.0 to 1.0
+    :param v: Value: 0.0 to 1.0
+
+    Returns an (r, g, b) tuple, each from 0 to 255.
+
+    """
+    r, g, b = colorsys.hsv_to_rgb(h, s, v)
+    return int(r * 255), int(g * 255), int(b * 255)
+
+
+def hsv_to_rgb_array(h, s=1.0, v=1.0):
+    """Convert many HSV colours to RGB at once.
+
+    If any argument is a NumPy array the conversion is vectorised and an
+    (N, 3) uint8 array is returned. Otherwise hues are looked up in a
+    precomputed table of HUE_STEPS entries and packed RGB bytes are returned.
+
+    Either result can be passed straight to Plasma.set_from_array.
+
+    :param h: Sequence of hues: 0.0 to 1.0
+    :param s: Saturation: 0.0 to 1.0, or a sequence with one per hue
+    :param v: Value: 0.0 to 1.0, or a sequence with one per hue
+
+    """
+    if hasattr(h, 'shape') or hasattr(s, 'shape') or hasattr(v, 'shape'):
+        return _hsv_to_rgb_numpy(h, s, v)
+
+    if isinstance(s, (int, float)) and isinstance(v, (int, float)):
+        if s == 1.0 and v == 1.0:
+            return bytearray(b''.join(_HUE_LUT_BYTES[int(x * HUE_STEPS) % HUE_STEPS] for x in h))
+        s = [s] * len(h)
+        v = [v] * len(h)
+    elif isinstance(s, (int, float)):
+        s = [s] * len(h)
+    elif isinstance(v, (int, float)):
+        v = [v] * len(h)
+
+    result = bytearray(len(h) * 3)
+    for x, (hue, sat, val) in enumerate(zip(h, s, v)):
+        r, g, b = _HUE_LUT[int(hue * HUE_STEPS) % HUE_STEPS]
+        low = val * (1.0 - sat)
+        scale = val * sat
+        result[x * 3] = int((low + scale * r) * 255)
+        result[x * 3 + 1] = int((low + scale * g) * 255)
+        result[x * 3 + 2] = int((low + scale * b) * 255)
+    return result
+
+
+def correction_table(gamma=1.0, scale=1.0):
+    """Build a 256 entry lookup table for gamma correction and scaling.
+
+    The result can be used with bytes.translate to correct a whole channel at once.
+
+    :param gamma: Gamma: 1.0 for none
+    :param scale: Output scale: 0.0 to 1.0
+
+    """
+    return bytes(bytearray(int(round(255 * scale * (x / 255.0) ** gamma)) for x in range(256)))
+
+
+def _hsv_to_rgb_numpy(h, s, v):
+    import numpy
+
+    h, s, v = numpy.broadcast_arrays(
+        numpy.asarray(h, dtype=numpy.float64) % 1.0,
+        numpy.asarray(s, dtype=numpy.float64),
+        numpy.asarray(v, dtype=numpy.float64))
+    i = (h * 6.0).astype(numpy.int64)
+    f = h * 6.0 - i
+    p = v * (1.0 - s)
+    q = v * (1.0 - s * f)
+    t = v * (1.0 - s * (1.0 - f))
+    i %= 6
+
+    result = numpy.empty(h.shape + (3,), dtype=numpy.uint8)
+    result[..., 0] = numpy.choose(i, [v, q, p, p, t, v]) * 255
+    result[..., 1] = numpy.choose(i, [t, v, v, q, p, p]) * 255
+    result[..., 2] = numpy.choose(i, [p, p, t, v, v, q]) * 255
+    return result
@@ -0,0 +1,188 @@
+import errno
+import os
+import select
+import socket
+
+MAX_LINE_LENGTH = 4096
+
+
+class LineBuffer(object):
+    """Split a stream of bytes into lines.
+
+    Partial lines are kept until the rest arrives. Lines longer than
+    MAX_LINE_LENGTH are discarded.
+
+    """
+
+    def __init__(self):
+        self._buffer = b''
+        # Set while dropping the rest of an overlong line
+        self._discarding = False
+
+    def feed(self, data):
+        """Add data and return a list of any complete, non-empty lines."""
+        self._buffer += data
+        lines = self._buffer.split(b'\n')
+        self._buffer = lines.pop()
+        if self._discarding:
+            if lines:
+                lines.pop(0)
+                self._discarding = False
+            else:
+                self._buffer = b''
+        if len(self._buffer) > MAX_LINE_LENGTH:
+            self._buffer = b''
+            self._discarding = True
+        lines = [line.decode('utf-8', 'replace').strip() for line in lines if len(line) <= MAX_LINE_LENGTH]
+        return [line for line in lines if line]
+
+
+class Connection(object):
+    """A client connected to the control socket."""
+
+    def __init__(self, sock):
+        self.socket = sock
+        self.socket.setblocking(False)
+        self.buffer = LineBuffer()
+        self._outgoing = b''
+
+    def fileno(self):
+        return self.socket.fileno()
+
+    def reply(self, message):
+        """Queue a single line reply to the client."""
+        self._outgoing += message.encode('utf-8') + b'\n'
+        self.flush()
+
+    def wants_write(self):
+        return len(self._outgoing) > 0
+
+    def flush(self):
+        """Send as much queued reply data as the socket will take without blocking."""
+        try:
+            sent = self.socket.send(self._outgoing)
+        except socket.error as e:
+            if e.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+                return
+            self._outgoing = b''
+            return
+        self._outgoing = self._outgoing[sent:]
+
+    def read(self):
+        """Return complete lines received, or None if the client has disconnected."""
+        try:
+            data = self.socket.recv(MAX_LINE_LENGTH)
+        except socket.error as e:
+            if e.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+                return []
+            return None
+        if not data:
+            return None
+        return self.buffer.feed(data)
+
+    def close(self):
+        self.socket.close()
+
+
+class ControlChannel(object):
+    """Non-blocking command input from a FIFO and an optional Unix domain socket.
+
+    Commands are newline terminated. Any number may arrive at once and
+    partial commands are buffered until complete, so reading never blocks.
+
+    """
+
+    def __init__(self, fifo_path, socket_path=None):
+        self._fifo_path = fifo_path
+        self._socket_path = socket_path
+        self._connections = []
+        self._fifo_buffer = LineBuffer()
+
+        try:
+            os.mkfifo(fifo_path)
+        except OSError:
+            pass
+        self._fifo = os.open(fifo_path, os.O_RDONLY | os.O_NONBLOCK)
+        # Hold the write end open too, so the FIFO never reports end-of-file
+        # (and is never readable with nothing to read) once a writer closes it
+        self._fifo_writer = os.open(fifo_path, os.O_WRONLY | os.O_NONBLOCK)
+
+        self._listener = None
+        if socket_path is not None:
+            try:
+                os.unlink(socket_path)
+            except OSError:
+                pass
+            self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._listener.bind(socket_path)
+            self._listener.listen(5)
+            self._listener.setblocking(False)
+
+    def poll(self, timeout=0):
+        """Wait up to timeout seconds for commands.
+
+        Returns as soon as any complete commands are available, as a list of
+        (command, connection) tuples. The connection is None for commands
+        received over the FIFO, otherwise replies can be sent with
+        connection.reply.
+
+        :param timeout: Maximum time to wait in seconds
+
+        """
+        readers = [self._fifo] + self._connections
+        if self._listener is not None:
+            readers.append(self._listener)
+        writers = [c for c in self._connections if c.wants_write()]
+
+        try:
+            readable, writable, _ = select.select(readers, writers, [], timeout)
+        except select.error as e:
+            if e.args[0] == errno.EINTR:
+                return []
+            raise
+
+        for writer in writable:
+            writer.flush()
+
+        commands = []
+        for reader in readable:
+            if reader is self._fifo:
+                try:
+                    data = os.read(self._fifo, MAX_LINE_LENGTH)
+                except OSError as e:
+                    if e.errno not in (errno.EAGAIN, errno.EWOULDBLOCK):
+                        raise
+                    data = b''
+                commands += [(line, None) for line in self._fifo_buffer.feed(data)]
+            elif reader is self._listener:
+                try:
+                    sock, _ = self._listener.accept()
+                except socket.error:
+                    continue
+                self._connections.append(Connection(sock))
+            else:
+                lines = reader.read()
+                if lines is None:
+                    self._connections.remove(reader)
+                    reader.close()
+                    continue
+                commands += [(line, reader) for line in lines]
+
+        return commands
+
+    def close(self):
+        for connection in self._connections:
+            connection.close()
+        self._connections = []
+        os.close(self._fifo)
+        os.close(self._fifo_writer)
+        os.remove(self._fifo_path)
+        if self._listener is not None:
+            self._listener.close()
+            os.remove(self._socket_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, e_type, e_value, traceback):
+        self.close()
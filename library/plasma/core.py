@@ -1,18 +1,80 @@
 import atexit
+import threading
+import time
+
+from .colour import hsv_to_rgb, hsv_to_rgb_array, correction_table
 
 PIXELS_PER_LIGHT = 4
 DEFAULT_BRIGHTNESS = 3
 MAX_BRIGHTNESS = 3
+BYTES_PER_PIXEL = 4
+
+_BRIGHTNESS_MASK = bytes(bytearray(x & 0b11111 for x in range(256)))
+
+
+def _union(a, b):
+    """Return the (start, stop) range covering two ranges, either of which may be None."""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return min(a[0], b[0]), max(a[1], b[1])
 
 
 class Plasma():
     def __init__(self, light_count):
         self._light_count = light_count
-        self._pixels = [[0, 0, 0, DEFAULT_BRIGHTNESS]] * light_count * PIXELS_PER_LIGHT
+        self._pixels = self._new_buffer(light_count * PIXELS_PER_LIGHT)
+        self._dirty_start = 0
+        self._dirty_stop = light_count * PIXELS_PER_LIGHT
         self._clear_on_exit = False
+        self._skip_unchanged = True
+        self._keepalive = None
+        self._last_frame = None
+        self._last_show = 0
+        self._writer = None
+        self._writer_stop = False
+        self._writer_error = None
+        self._frame_ready = threading.Condition()
+        self._frame_pending = False
+        self._frames_dropped = 0
+        self._pending_dirty = None
+        self._gamma = 1.0
+        self._white_balance = (1.0, 1.0, 1.0)
+        self._dimming = 1.0
+        self._correction = None
+        self._corrected = None
 
         atexit.register(self.atexit)
 
+    def _new_buffer(self, pixel_count):
+        """Allocate a blank pixel buffer.
+
+        Pixels are stored contiguously as four bytes each: red, green, blue and
+        brightness (0 to MAX_BRIGHTNESS), matching the wire order used by Plasma USB.
+
+        """
+        buf = bytearray(pixel_count * BYTES_PER_PIXEL)
+        buf[3::BYTES_PER_PIXEL] = bytearray([DEFAULT_BRIGHTNESS]) * pixel_count
+        return buf
+
+    def _mark_dirty(self, start, stop):
+        """Record that pixels start to stop have changed since the last show."""
+        if start < self._dirty_start:
+            self._dirty_start = start
+        if stop > self._dirty_stop:
+            self._dirty_stop = stop
+
+    def _take_dirty(self):
+        """Return the changed (start, stop) pixel range, or None, and reset it."""
+        count = self.get_pixel_count()
+        start, stop = max(0, self._dirty_start), min(count, self._dirty_stop)
+        self._dirty_start = count
+        self._dirty_stop = 0
+        if start >= stop:
+            return None
+        return start, stop
+
     def get_pixel_count(self):
         return self._light_count * PIXELS_PER_LIGHT
 
@@ -20,22 +82,285 @@ class Plasma():
         return self._light_count
 
     def show(self):
+        """Output the buffer.
+
+        If the buffer is identical to the last frame output, and no keepalive
+        is due, nothing is sent.
+
+        """
+        if self._writer_error is not None:
+            error, self._writer_error = self._writer_error, None
+            self._output_failed()
+            raise error
+
+        if not self._frame_changed():
+            self._take_dirty()
+            return
+
+        dirty = self._take_dirty()
+        if self._writer is None:
+            pixels = self._pixels
+            try:
+                if self._correction is not None:
+                    if self._corrected is None:
+                        self._corrected = self._new_buffer(self.get_pixel_count())
+                    self._correct(pixels, self._corrected)
+                    pixels = self._corrected
+                self._show(pixels, dirty)
+            except Exception:
+                self._output_failed()
+                raise
+            self._frame_sent()
+            return
+
+        with self._frame_ready:
+            if self._frame_pending:
+                self._frames_dropped += 1
+            if self._correction is not None:
+                self._correct(self._pixels, self._back)
+            else:
+                self._back[:] = self._pixels
+            self._pending_dirty = _union(self._pending_dirty, dirty)
+            self._frame_pending = True
+            self._frame_ready.notify()
+        self._frame_sent()
+
+    def _show(self, pixels, dirty):
+        """Output a pixel buffer to the device.
+
+        :param pixels: Buffer to output, allocated by _new_buffer
+        :param dirty: (start, stop) range of pixels changed since the last output, or None
+
+        """
         raise NotImplementedError
 
+    def _correct(self, pixels, target):
+        """Copy pixels into target through the gamma, white balance and dimming tables."""
+        lut_r, lut_g, lut_b = self._correction
+        if not isinstance(pixels, bytearray):
+            pixels = bytearray(pixels)
+        target[0::BYTES_PER_PIXEL] = pixels[0::BYTES_PER_PIXEL].translate(lut_r)
+        target[1::BYTES_PER_PIXEL] = pixels[1::BYTES_PER_PIXEL].translate(lut_g)
+        target[2::BYTES_PER_PIXEL] = pixels[2::BYTES_PER_PIXEL].translate(lut_b)
+        target[3::BYTES_PER_PIXEL] = pixels[3::BYTES_PER_PIXEL]
+
+    def _update_correction(self):
+        if self._gamma == 1.0 and self._dimming == 1.0 and self._white_balance == (1.0, 1.0, 1.0):
+            self._correction = None
+        else:
+            self._correction = tuple(correction_table(self._gamma, self._dimming * c) for c in self._white_balance)
+        # Force the next show to output every pixel with the new tables
+        self._last_frame = None
+        self._mark_dirty(0, self.get_pixel_count())
+
+    def set_gamma(self, gamma):
+        """Set the gamma correction applied to colours as they are output.
+
+        :param gamma: Gamma: 1.0 for none, around 2.2 to 2.8 for perceptually even fades
+
+        """
+        if gamma <= 0:
+            raise ValueError('Gamma should be greater than 0')
+        self._gamma = float(gamma)
+        self._update_correction()
+
+    def set_white_balance(self, r, g, b):
+        """Set a scale factor for each colour channel as it is output.
+
+        :param r: Red scale: 0.0 to 1.0
+        :param g: Green scale: 0.0 to 1.0
+        :param b: Blue scale: 0.0 to 1.0
+
+        """
+        for c in (r, g, b):
+            if c < 0 or c > 1:
+                raise ValueError('White balance should be between 0.0 and 1.0')
+        self._white_balance = (float(r), float(g), float(b))
+        self._update_correction()
+
+    def set_dimming(self, dimming):
+        """Set software dimming applied to all colours as they are output.
+
+        Unlike set_brightness, which is limited to the few global brightness
+        levels of the LEDs, this scales every colour value.
+
+        :param dimming: Dimming: 0.0 to 1.0
+
+        """
+        if dimming < 0 or dimming > 1:
+            raise ValueError('Dimming should be between 0.0 and 1.0')
+        self._dimming = float(dimming)
+        self._update_correction()
+
+    def set_async(self, status=True):
+        """Set whether show should hand frames to a background writer thread.
+
+        Rendering the next frame then overlaps with outputting the last one.
+        If output falls behind, stale frames are dropped rather than queued.
+
+        :param status: True or False (default True)
+
+        """
+        if status and self._writer is None:
+            self._back = self._new_buffer(self.get_pixel_count())
+            self._front = self._new_buffer(self.get_pixel_count())
+            self._writer_stop = False
+            self._writer = threading.Thread(target=self._write_frames)
+            self._writer.daemon = True
+            self._writer.start()
+        elif not status and self._writer is not None:
+            with self._frame_ready:
+                self._writer_stop = True
+                self._frame_ready.notify()
+            self._writer.join()
+            self._writer = None
+
+    def get_frames_dropped(self):
+        """Return the number of frames dropped because output fell behind."""
+        return self._frames_dropped
+
+    def _write_frames(self):
+        while True:
+            with self._frame_ready:
+                while not self._frame_pending and not self._writer_stop:
+                    self._frame_ready.wait()
+                if not self._frame_pending:
+                    return
+                self._back, self._front = self._front, self._back
+                dirty, self._pending_dirty = self._pending_dirty, None
+                self._frame_pending = False
+
+            try:
+                self._show(self._front, dirty)
+            except Exception as e:
+                self._writer_error = e
+
+    def _frame_changed(self):
+        """Return True if the buffer must be output."""
+        if self._skip_unchanged and self._last_frame == self._pixels:
+            if self._keepalive is None or time.time() - self._last_show < self._keepalive:
+                return False
+        return True
+
+    def _frame_sent(self):
+        """Remember the buffer as the last frame output."""
+        if self._last_frame is None:
+            self._last_frame = bytearray(self._pixels)
+        else:
+            self._last_frame[:] = self._pixels
+        self._last_show = time.time()
+
+    def _output_failed(self):
+        """Forget the last frame, so the whole buffer is output again by the next show."""
+        self._last_frame = None
+        self._mark_dirty(0, self.get_pixel_count())
+
+    def set_skip_unchanged(self, status=True):
+        """Set whether show should skip frames identical to the last one output.
+
+        :param status: True or False (default True)
+
+        """
+        self._skip_unchanged = status
+
+    def set_keepalive(self, interval):
+        """Set how often an unchanged frame should be output anyway.
+
+        Useful for chains that need periodic refreshing, or that may be hot-plugged.
+
+        :param interval: Interval in seconds, or None to never resend an unchanged frame
+
+        """
+        self._keepalive = interval
+
     def atexit(self):
+        self.set_async(False)
         if not self._clear_on_exit:
             return
         self.clear()
         self.show()
 
     def set_light_count(self, light_count):
-        raise NotImplementedError
+        """Change the number of lights in your Plasma chain.
 
-    def set_light_hsv(self, index, h, s, v):
-        raise NotImplementedError
+        The buffer is resized in place where possible. Lights that remain
+        keep their colours, new lights start blank.
 
-    def set_pixel_hsv(self, index, h, s, v):
-        raise NotImplementedError
+        :param light_count: Number of lights
+
+        """
+        if light_count < 0:
+            raise ValueError('Light count should not be negative')
+
+        threaded = self._writer is not None
+        self.set_async(False)
+
+        old_count = self.get_pixel_count()
+        pixel_count = light_count * PIXELS_PER_LIGHT
+        if isinstance(self._pixels, bytearray):
+            if pixel_count > old_count:
+                self._pixels += self._new_buffer(pixel_count - old_count)
+            else:
+                del self._pixels[pixel_count * BYTES_PER_PIXEL:]
+        else:
+            pixels = self._new_buffer(pixel_count)
+            keep = min(old_count, pixel_count) * BYTES_PER_PIXEL
+            pixels[0:keep] = self._pixels[0:keep]
+            self._pixels = pixels
+
+        self._light_count = light_count
+        self._resize(old_count, pixel_count)
+
+        self._corrected = None
+        self._last_frame = None
+        self._dirty_start = 0
+        self._dirty_stop = pixel_count
+
+        self.set_async(threaded)
+
+    def _resize(self, old_pixel_count, pixel_count):
+        """Resize any backend resources after the pixel buffer has been resized."""
+        pass
+
+    def set_light_hsv(self, index, h, s, v, brightness=None):
+        """Set the HSV colour of an individual light in your Plasma chain.
+
+        :param index: Index of the light in your chain (starting at 0)
+        :param h: Hue: 0.0 to 1.0
+        :param s: Saturation: 0.0 to 1.0
+        :param v: Value: 0.0 to 1.0
+        :param brightness: Brightness: 0.0 to 1.0 (optional)
+
+        """
+        r, g, b = hsv_to_rgb(h, s, v)
+        self.set_light(index, r, g, b, brightness)
+
+    def set_pixel_hsv(self, index, h, s, v, brightness=None):
+        """Set the HSV colour, and optionally brightness, of a single pixel.
+
+        :param index: Index of the pixel
+        :param h: Hue: 0.0 to 1.0
+        :param s: Saturation: 0.0 to 1.0
+        :param v: Value: 0.0 to 1.0
+        :param brightness: Brightness: 0.0 to 1.0 (optional)
+
+        """
+        r, g, b = hsv_to_rgb(h, s, v)
+        self.set_pixel(index, r, g, b, brightness)
+
+    def set_pixels_hsv(self, h, s=1.0, v=1.0, offset=0, brightness=None):
+        """Set the HSV colour of many pixels at once.
+
+        See plasma.colour.hsv_to_rgb_array for the accepted values.
+
+        :param h: Sequence or NumPy array of hues: 0.0 to 1.0
+        :param s: Saturation: 0.0 to 1.0, or one per hue
+        :param v: Value: 0.0 to 1.0, or one per hue
+        :param offset: Index of the first pixel to set
+        :param brightness: Brightness: 0.0 to 1.0 (optional)
+
+        """
+        self.set_from_array(hsv_to_rgb_array(h, s, v), offset, brightness=brightness)
 
     def set_clear_on_exit(self, status=True):
         self._clear_on_exit = status
@@ -51,9 +376,12 @@ class Plasma():
         :param b: Amount of blue: 0 to 255
 
         """
+        if index < 0:
+            index += self.get_light_count()
+        if not 0 <= index < self.get_light_count():
+            raise IndexError('Light index out of range')
         offset = index * PIXELS_PER_LIGHT
-        for x in range(PIXELS_PER_LIGHT):
-            self.set_pixel(offset + x, r, g, b, brightness)
+        self.set_range(offset, offset + PIXELS_PER_LIGHT, r, g, b, brightness)
 
     def set_all(self, r, g, b, brightness=None):
         """Set the RGB value and optionally brightness of all pixels.
@@ -66,8 +394,126 @@ class Plasma():
         :param brightness: Brightness: 0.0 to 1.0 (default is 1.0)
 
         """
-        for x in range(self._light_count * PIXELS_PER_LIGHT):
-            self.set_pixel(x, r, g, b, brightness)
+        self.set_range(0, self.get_pixel_count(), r, g, b, brightness)
+
+    def set_range(self, start, stop, r, g, b, brightness=None):
+        """Set the RGB value, and optionally brightness, of a run of pixels.
+
+        Pixels outside of the chain are ignored.
+
+        :param start: Index of the first pixel to set
+        :param stop: Index one past the last pixel to set
+        :param r: Amount of red: 0 to 255
+        :param g: Amount of green: 0 to 255
+        :param b: Amount of blue: 0 to 255
+        :param brightness: Brightness: 0.0 to 1.0 (optional)
+
+        """
+        start = max(start, 0)
+        stop = min(stop, self.get_pixel_count())
+        count = stop - start
+        if count <= 0:
+            return
+
+        self._mark_dirty(start, stop)
+
+        pixels = self._pixels
+        start *= BYTES_PER_PIXEL
+        stop *= BYTES_PER_PIXEL
+        pixels[start:stop:BYTES_PER_PIXEL] = bytearray([int(r) & 0xff]) * count
+        pixels[start + 1:stop:BYTES_PER_PIXEL] = bytearray([int(g) & 0xff]) * count
+        pixels[start + 2:stop:BYTES_PER_PIXEL] = bytearray([int(b) & 0xff]) * count
+        if brightness is not None:
+            brightness = int(float(MAX_BRIGHTNESS) * brightness) & 0b11111
+            pixels[start + 3:stop:BYTES_PER_PIXEL] = bytearray([brightness]) * count
+
+    def set_pixels(self, pixels, offset=0, brightness=None):
+        """Set the RGB value, and optionally brightness, of many pixels at once.
+
+        Pixels that would run past the end of the chain are ignored.
+
+        :param pixels: A sequence of (r, g, b) values, bytes-like RGB data or an (N, 3) NumPy array
+        :param offset: Index of the first pixel to set
+        :param brightness: Brightness: 0.0 to 1.0 (optional)
+
+        """
+        if not isinstance(pixels, (bytes, bytearray, memoryview)) and not hasattr(pixels, 'shape'):
+            pixels = bytearray(int(c) & 0xff for pixel in pixels for c in pixel[0:3])
+
+        self.set_from_array(pixels, offset, brightness=brightness)
+
+    def set_from_array(self, data, offset=0, channels=3, brightness=None):
+        """Copy a block of colour data into the pixel buffer in one pass.
+
+        Data may be bytes-like, packed as RGB or RGBA, or a NumPy array
+        of shape (N, 3) or (N, 4). For four channel data the last channel
+        is stored as the raw brightness, from 0 to MAX_BRIGHTNESS.
+
+        Pixels that would run past the end of the chain are ignored.
+
+        :param data: Colour data for consecutive pixels
+        :param offset: Index of the first pixel to set
+        :param channels: Channels per pixel in bytes-like data: 3 or 4
+        :param brightness: Brightness: 0.0 to 1.0 (optional, overrides channel 4)
+
+        """
+        if channels not in (3, 4):
+            raise ValueError('Channels should be 3 or 4')
+        if offset < 0:
+            raise ValueError('Offset should not be negative')
+
+        if hasattr(data, 'shape') and not isinstance(data, memoryview):
+            count = self._set_from_numpy(data, offset, channels)
+        else:
+            if not isinstance(data, (bytes, bytearray)):
+                data = bytearray(data)
+
+            count = min(len(data) // channels, self.get_pixel_count() - offset)
+            if count <= 0:
+                return
+
+            pixels = self._pixels
+            start = offset * BYTES_PER_PIXEL
+            stop = start + count * BYTES_PER_PIXEL
+            length = count * channels
+            pixels[start:stop:BYTES_PER_PIXEL] = data[0:length:channels]
+            pixels[start + 1:stop:BYTES_PER_PIXEL] = data[1:length:channels]
+            pixels[start + 2:stop:BYTES_PER_PIXEL] = data[2:length:channels]
+            if channels == 4:
+                pixels[start + 3:stop:BYTES_PER_PIXEL] = data[3:length:channels].translate(_BRIGHTNESS_MASK)
+
+        if count > 0:
+            self._mark_dirty(offset, offset + count)
+
+        if brightness is not None and count > 0:
+            brightness = int(float(MAX_BRIGHTNESS) * brightness) & 0b11111
+            start = offset * BYTES_PER_PIXEL
+            self._pixels[start + 3:start + count * BYTES_PER_PIXEL:BYTES_PER_PIXEL] = bytearray([brightness]) * count
+
+    def _set_from_numpy(self, data, offset, channels):
+        import numpy
+
+        if data.ndim == 1:
+            data = data.reshape(-1, channels)
+        count = min(data.shape[0], self.get_pixel_count() - offset)
+        if count <= 0:
+            return 0
+
+        view = numpy.frombuffer(self._pixels, dtype=numpy.uint8).reshape(-1, BYTES_PER_PIXEL)
+        data = data[0:count].astype(numpy.int32)
+        view[offset:offset + count, 0:3] = data[:, 0:3] & 0xff
+        if data.shape[1] > 3:
+            view[offset:offset + count, 3] = data[:, 3] & 0b11111
+        return count
+
+    def _pixel_index(self, x):
+        """Return a pixel index with negative values counted from the end, or raise IndexError."""
+        count = self.get_pixel_count()
+        if x < 0:
+            x += count
+        if not 0 <= x < count:
+            raise IndexError('Pixel index out of range')
+        return x
 
     def get_pixel(self, x):
         """Get the RGB and brightness value of a specific pixel.
@@ -75,7 +521,8 @@ class Plasma():
         :param x: The horizontal position of the pixel: 0 to 7
 
         """
-        r, g, b, brightness = self._pixels[x]
+        offset = self._pixel_index(x) * BYTES_PER_PIXEL
+        r, g, b, brightness = self._pixels[offset:offset + BYTES_PER_PIXEL]
         brightness /= float(MAX_BRIGHTNESS)
 
         return r, g, b, round(brightness, 3)
@@ -92,17 +539,27 @@ class Plasma():
         :param brightness: Brightness: 0.0 to 1.0 (default around 0.2)
 
         """
-        if brightness is None:
-            brightness = self._pixels[x][3]
-        else:
-            brightness = int(float(MAX_BRIGHTNESS) * brightness) & 0b11111
-
-        self._pixels[x] = [int(r) & 0xff, int(g) & 0xff, int(b) & 0xff, brightness]
+        x = self._pixel_index(x)
+        if x < self._dirty_start:
+            self._dirty_start = x
+        if x >= self._dirty_stop:
+            self._dirty_stop = x + 1
+
+        offset = x * BYTES_PER_PIXEL
+        pixels = self._pixels
+        pixels[offset] = int(r) & 0xff
+        pixels[offset + 1] = int(g) & 0xff
+        pixels[offset + 2] = int(b) & 0xff
+        if brightness is not None:
+            pixels[offset + 3] = int(float(MAX_BRIGHTNESS) * brightness) & 0b11111
 
     def clear(self):
         """Clear the pixel buffer."""
-        for x in range(self._light_count * PIXELS_PER_LIGHT):
-            self._pixels[x][0:3] = [0, 0, 0]
+        self._mark_dirty(0, self.get_pixel_count())
+        blank = bytearray(self.get_pixel_count())
+        self._pixels[0::BYTES_PER_PIXEL] = blank
+        self._pixels[1::BYTES_PER_PIXEL] = blank
+        self._pixels[2::BYTES_PER_PIXEL] = blank
 
     def set_brightness(self, brightness):
         """Set the brightness of all pixels.
@@ -113,5 +570,6 @@ class Plasma():
         if brightness < 0 or brightness > 1:
             raise ValueError('Brightness should be between 0.0 and 1.0')
 
-        for x in range(self._light_count * PIXELS_PER_LIGHT):
-            self._pixels[x][3] = int(float(MAX_BRIGHTNESS) * brightness) & 0b11111
+        self._mark_dirty(0, self.get_pixel_count())
+        brightness = int(float(MAX_BRIGHTNESS) * brightness) & 0b11111
+        self._pixels[3::BYTES_PER_PIXEL] = bytearray([brightness]) * self.get_pixel_count()
@@ -0,0 +1,179 @@
+import errno
+import select
+import socket
+import struct
+import sys
+
+E131_PORT = 5568
+CHANNELS_PER_UNIVERSE = 512
+CHANNELS_PER_PIXEL = 3
+
+_ACN_ID = b'ASC-E1.17\x00\x00\x00'
+_VECTOR_ROOT_DATA = 0x00000004
+_VECTOR_ROOT_EXTENDED = 0x00000008
+_VECTOR_FRAMING_DATA = 0x00000002
+_VECTOR_FRAMING_SYNC = 0x00000001
+_OPTION_PREVIEW = 0x40
+
+# Offsets into E1.31 packets
+_ROOT = struct.Struct('!HH12sHI16s')
+_DATA_FRAMING = struct.Struct('!HI64sBHBBH')
+_SYNC_FRAMING = struct.Struct('!HIBH')
+_DMP_COUNT = 123
+_DMP_DATA = 126
+
+
+class E131Receiver(object):
+    """Receive E1.31 (sACN) DMX data into a Plasma device.
+
+    Pixels are mapped as consecutive RGB channel triplets, starting at
+    channel in universe and carrying on into following universes, with up
+    to pixels_per_universe pixels each (by default as many as will fit). Data is copied straight into the
+    device's buffer. Packets that request synchronisation are shown when
+    the matching sync packet arrives, other packets are shown right away.
+
+    """
+
+    def __init__(self, plasma, universe=1, channel=1, pixels_per_universe=None,
+                 address='', port=E131_PORT, multicast=True):
+        if pixels_per_universe is None:
+            pixels_per_universe = (CHANNELS_PER_UNIVERSE - channel + 1) // CHANNELS_PER_PIXEL
+        if channel < 1 or pixels_per_universe < 1 or channel - 1 + pixels_per_universe * CHANNELS_PER_PIXEL > CHANNELS_PER_UNIVERSE:
+            raise ValueError('Pixels should fit within the 512 channels of a universe')
+        self._plasma = plasma
+        self._universe = universe
+        self._channel = channel
+        self._pixels_per_universe = pixels_per_universe
+        pixel_count = plasma.get_pixel_count()
+        self._universe_count = (pixel_count + pixels_per_universe - 1) // pixels_per_universe
+        self._sequences = {}
+        self._pending_sync = set()
+
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind((address, port))
+        self._socket.setblocking(False)
+
+        if multicast:
+            for u in range(universe, universe + self._universe_count):
+                group = socket.inet_aton('239.255.{}.{}'.format(u >> 8, u & 0xff))
+                mreq = group + socket.inet_aton('0.0.0.0')
+                self._socket.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, mreq)
+
+    def fileno(self):
+        return self._socket.fileno()
+
+    def get_address(self):
+        """Return the (host, port) the receiver is bound to."""
+        return self._socket.getsockname()
+
+    def poll(self, timeout=0):
+        """Wait up to timeout seconds for packets, then handle all that have arrived.
+
+        Returns the number of packets applied to the device.
+
+        :param timeout: Maximum time to wait in seconds
+
+        """
+        readable, _, _ = select.select([self._socket], [], [], timeout)
+        if not readable:
+            return 0
+
+        applied = 0
+        show = False
+        while True:
+            try:
+                packet = self._socket.recv(1024)
+            except socket.error as e:
+                if e.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    break
+                raise
+            result = self._handle(packet)
+            if result is not None:
+                applied += 1
+                show = show or result
+
+        if show:
+            self._plasma.show()
+        return applied
+
+    def _handle(self, packet):
+        """Apply one packet, returning whether to show, or None if it was ignored."""
+        if len(packet) < _ROOT.size + _SYNC_FRAMING.size:
+            return None
+        _, _, acn_id, _, vector, _ = _ROOT.unpack_from(packet)
+        if acn_id != _ACN_ID:
+            return None
+
+        if vector == _VECTOR_ROOT_EXTENDED:
+            _, framing_vector, _, sync_address = _SYNC_FRAMING.unpack_from(packet, _ROOT.size)
+            if framing_vector != _VECTOR_FRAMING_SYNC or sync_address not in self._pending_sync:
+                return None
+            self._pending_sync.discard(sync_address)
+            return True
+
+        if vector != _VECTOR_ROOT_DATA or len(packet) < _DMP_DATA:
+            return None
+        _, framing_vector, _, _, sync_address, sequence, options, universe = _DATA_FRAMING.unpack_from(packet, _ROOT.size)
+        if framing_vector != _VECTOR_FRAMING_DATA or options & _OPTION_PREVIEW:
+            return None
+
+        index = universe - self._universe
+        if index < 0 or index >= self._universe_count:
+            return None
+        # Drop packets arriving out of order, as recommended by the standard
+        last = self._sequences.get(universe)
+        if last is not None and -20 < ((sequence - last + 128) % 256) - 128 <= 0:
+            return None
+        self._sequences[universe] = sequence
+
+        # Property values start with the DMX start code, which must be 0 for dimmer data
+        count = struct.unpack_from('!H', packet, _DMP_COUNT)[0] - 1
+        if packet[_DMP_DATA - 1:_DMP_DATA] != b'\x00':
+            return None
+        start = _DMP_DATA + self._channel - 1
+        stop = min(start + self._pixels_per_universe * CHANNELS_PER_PIXEL, _DMP_DATA + count, len(packet))
+        self._plasma.set_from_array(packet[start:stop], index * self._pixels_per_universe)
+
+        if sync_address:
+            self._pending_sync.add(sync_address)
+            return False
+        return True
+
+    def close(self):
+        self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, e_type, e_value, traceback):
+        self.close()
+
+
+def main(args):
+    """Drive a Plasma device from E1.31 until interrupted."""
+    from optparse import OptionParser
+    from . import get_device
+
+    parser = OptionParser(usage='python -m plasma.e131 [options]')
+    parser.add_option('-o', '--device', default='GPIO:15:14', help='set output device')
+    parser.add_option('-l', '--lights', type='int', default=10, help='set number of lights in your plasma chain')
+    parser.add_option('-u', '--universe', type='int', default=1, help='set the first universe')
+    parser.add_option('-c', '--channel', type='int', default=1, help='set the first DMX channel in each universe')
+    parser.add_option('--unicast', action='store_false', dest='multicast', default=True,
+                      help='do not join the multicast groups for each universe')
+    opts = parser.parse_args(args)[0]
+
+    Plasma, device_args = get_device(opts.device)
+    plasma = Plasma(opts.lights, **device_args)
+    with E131Receiver(plasma, opts.universe, opts.channel, multicast=opts.multicast) as receiver:
+        try:
+            while True:
+                receiver.poll(1.0)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -1,5 +1,6 @@
 import time
 from .core import Plasma
+from .apa102 import APA102Encoder
 
 
 class PlasmaGPIO(Plasma):
@@ -13,6 +14,7 @@ class PlasmaGPIO(Plasma):
         self._gpio_clock = gpio_clock
         self._gpio_is_setup = False
         Plasma.__init__(self, light_count)
+        self._encoder = APA102Encoder(self.get_pixel_count())
 
     def use_pins(self, gpio_data, gpio_clock):
         raise NotImplementedError
@@ -44,7 +46,10 @@ class PlasmaGPIO(Plasma):
             self._gpio.output(self._gpio_clock, 0)
             time.sleep(0.0000005)
 
-    def show(self):
+    def _resize(self, old_pixel_count, pixel_count):
+        self._encoder.resize(pixel_count)
+
+    def _show(self, pixels, dirty):
         """Output the buffer."""
         if not self._gpio_is_setup:
             self._gpio.setmode(self._gpio.BCM)
@@ -53,13 +58,12 @@ class PlasmaGPIO(Plasma):
             self._gpio.setup(self._gpio_clock, self._gpio.OUT)
             self._gpio_is_setup = True
 
+        if dirty is not None:
+            self._encoder.encode(pixels, *dirty)
+
         self._sof()
 
-        for pixel in self._pixels:
-            r, g, b, brightness = pixel
-            self._write_byte(0b11100000 | brightness)
-            self._write_byte(b)
-            self._write_byte(g)
-            self._write_byte(r)
+        for byte in bytearray(self._encoder.get_pixel_data()):
+            self._write_byte(byte)
 
         self._eof()
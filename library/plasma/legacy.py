@@ -4,6 +4,8 @@ import time
 
 import RPi.GPIO as GPIO
 
+from .apa102 import APA102Encoder
+
 
 __version__ = '0.0.1'
 
@@ -16,6 +18,7 @@ NUM_PIXELS = 0
 
 
 pixels = []
+_encoder = APA102Encoder(0)
 
 _light_count = 0
 _gpio_setup = False
@@ -40,10 +43,13 @@ def use_pins(data, clock):
 
 def set_light_count(light_count):
     """Set the number of light modules in your Plasma chain."""
-    global _light_count, pixels, NUM_PIXELS
+    global _light_count, pixels, NUM_PIXELS, _encoder
     _light_count = light_count
     NUM_PIXELS = light_count * PIXELS_PER_LIGHT
     pixels = [[0, 0, 0, DEFAULT_BRIGHTNESS]] * light_count * PIXELS_PER_LIGHT
+    _encoder = APA102Encoder(NUM_PIXELS)
+    for x in range(NUM_PIXELS):
+        _encoder.set_pixel(x, *pixels[x])
 
 
 def set_light(index, r, g, b):
@@ -73,12 +79,14 @@ def set_brightness(brightness):
 
     for x in range(_light_count * PIXELS_PER_LIGHT):
         pixels[x][3] = int(float(MAX_BRIGHTNESS) * brightness) & 0b11111
+        _encoder.set_pixel(x, *pixels[x])
 
 
 def clear():
     """Clear the pixel buffer."""
     for x in range(_light_count * PIXELS_PER_LIGHT):
         pixels[x][0:3] = [0, 0, 0]
+        _encoder.set_pixel(x, *pixels[x])
 
 
 def _write_byte(byte):
@@ -125,12 +133,8 @@ def show():
 
     _sof()
 
-    for pixel in pixels:
-        r, g, b, brightness = pixel
-        _write_byte(0b11100000 | brightness)
-        _write_byte(b)
-        _write_byte(g)
-        _write_byte(r)
+    for byte in bytearray(_encoder.get_pixel_data()):
+        _write_byte(byte)
 
     _eof()
 
@@ -180,6 +184,7 @@ def set_pixel(x, r, g, b, brightness=None):
         brightness = int(float(MAX_BRIGHTNESS) * brightness) & 0b11111
 
     pixels[x] = [int(r) & 0xff, int(g) & 0xff, int(b) & 0xff, brightness]
+    _encoder.set_pixel(x, *pixels[x])
 
 
 def set_clear_on_exit(value=True):
@@ -0,0 +1,120 @@
+class PlasmaMatrix(object):
+    """2D coordinates for a grid of pixels, such as a Unicorn HAT.
+
+    The grid is wired row by row, width pixels per row, starting at offset
+    on the underlying Plasma device. With serpentine wiring every other row
+    runs backwards. Rotation (clockwise, in degrees) and flips are applied
+    to the coordinates you draw with.
+
+    The mapping is precomputed once, so whole frames are copied onto the
+    chain with a handful of slice copies, or a single NumPy gather.
+
+    """
+
+    def __init__(self, plasma, width, height, serpentine=False, rotation=0, flip_x=False, flip_y=False, offset=0):
+        if rotation not in (0, 90, 180, 270):
+            raise ValueError('Rotation should be 0, 90, 180 or 270')
+        if offset < 0 or offset + width * height > plasma.get_pixel_count():
+            raise ValueError('Matrix does not fit on the device')
+
+        self._plasma = plasma
+        self._offset = offset
+        if rotation in (90, 270):
+            self._width, self._height = height, width
+        else:
+            self._width, self._height = width, height
+
+        self._table = []
+        for row in range(self._height):
+            for column in range(self._width):
+                x = self._width - 1 - column if flip_x else column
+                y = self._height - 1 - row if flip_y else row
+                if rotation == 90:
+                    px, py = y, height - 1 - x
+                elif rotation == 180:
+                    px, py = width - 1 - x, height - 1 - y
+                elif rotation == 270:
+                    px, py = width - 1 - y, x
+                else:
+                    px, py = x, y
+                if serpentine and py % 2:
+                    px = width - 1 - px
+                self._table.append(py * width + px)
+
+        self._inverse = [0] * len(self._table)
+        for index, pixel in enumerate(self._table):
+            self._inverse[pixel] = index
+        self._runs = _find_runs(self._inverse)
+
+    def get_shape(self):
+        """Return the (width, height) of the grid as drawn, after rotation."""
+        return self._width, self._height
+
+    def get_index(self, x, y):
+        """Return the index on the device of the pixel at x, y."""
+        if not (0 <= x < self._width and 0 <= y < self._height):
+            raise IndexError('Matrix coordinates out of range')
+        return self._offset + self._table[y * self._width + x]
+
+    def get_xy(self, x, y):
+        """Get the RGB and brightness value of the pixel at x, y."""
+        return self._plasma.get_pixel(self.get_index(x, y))
+
+    def set_xy(self, x, y, r, g, b, brightness=None):
+        """Set the RGB value, and optionally brightness, of the pixel at x, y.
+
+        :param x: Horizontal position, from the left
+        :param y: Vertical position, from the top
+        :param r: Amount of red: 0 to 255
+        :param g: Amount of green: 0 to 255
+        :param b: Amount of blue: 0 to 255
+        :param brightness: Brightness: 0.0 to 1.0 (optional)
+
+        """
+        self._plasma.set_pixel(self.get_index(x, y), r, g, b, brightness)
+
+    def set_array(self, data, brightness=None):
+        """Set every pixel from a whole 2D frame.
+
+        :param data: A (height, width, 3) NumPy array, or bytes-like RGB data in rows from the top
+        :param brightness: Brightness: 0.0 to 1.0 (optional)
+
+        """
+        count = self._width * self._height
+        if hasattr(data, 'shape') and not isinstance(data, memoryview):
+            linear = data.reshape(count, -1)[self._inverse]
+        else:
+            data = bytearray(data)
+            if len(data) < count * 3:
+                raise ValueError('Expected {} bytes of RGB data'.format(count * 3))
+            linear = bytearray(count * 3)
+            for dst, src, length, step in self._runs:
+                if step == 1:
+                    linear[dst * 3:(dst + length) * 3] = data[src * 3:(src + length) * 3]
+                else:
+                    first = src - length + 1
+                    for channel in range(3):
+                        linear[dst * 3 + channel:(dst + length) * 3:3] = data[first * 3 + channel:(src + 1) * 3:3][::-1]
+
+        self._plasma.set_from_array(linear, self._offset, brightness=brightness)
+
+    def show(self):
+        """Output the underlying device."""
+        self._plasma.show()
+
+
+def _find_runs(indices):
+    """Split a gather table into (dst, src, length, step) runs of consecutive source indices."""
+    runs = []
+    dst = 0
+    while dst < len(indices):
+        src = indices[dst]
+        length = 1
+        step = 1
+        if dst + 1 < len(indices) and indices[dst + 1] == src - 1:
+            step = -1
+        while dst + length < len(indices) and indices[dst + length] == src + length * step:
+            length += 1
+        runs.append((dst, src, length, step))
+        dst += length
+    return runs
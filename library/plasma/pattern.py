@@ -0,0 +1,239 @@
+import collections
+import mmap
+import os
+import struct
+import tempfile
+
+FRAMES_EXT = '.frames'
+DEFAULT_CACHE_SIZE = 4 * 1024 * 1024
+
+_MAGIC = b'PLFR'
+_VERSION = 1
+# Magic, version, width, height, channels and the mtime of the source PNG
+_HEADER = struct.Struct('<4sHIIHd')
+
+
+class Pattern(object):
+    """A decoded pattern.
+
+    Each row of the image is one frame of animation, stored as packed
+    8-bit RGB or RGBA values in a single contiguous buffer.
+
+    """
+
+    def __init__(self, width, height, channels, data, mtime=0):
+        self.width = width
+        self.height = height
+        self.channels = channels
+        self.mtime = mtime
+        self._data = memoryview(data)
+        self._stride = width * channels
+        self._resampled = {}
+
+    def get_row(self, y):
+        """Return a view of the pixel data for a single row."""
+        offset = y * self._stride
+        return self._data[offset:offset + self._stride]
+
+    def get_data(self):
+        """Return a view of the pixel data for every row."""
+        return self._data
+
+    def get_size(self):
+        """Return the size of the pixel data, and any resampled copies, in bytes."""
+        return len(self._data) + sum(p.get_size() for p in self._resampled.values())
+
+    def resample(self, pixel_count):
+        """Return this pattern as RGB frames of exactly pixel_count pixels.
+
+        Rows are repeated across the chain, so a 1 pixel wide pattern is
+        duplicated to every LED and a 4 pixel wide one to every light.
+        Alpha is applied against black. The result is cached, so each row
+        can be copied straight into a device with Plasma.set_from_array.
+
+        :param pixel_count: Number of pixels in the chain
+
+        """
+        frames = self._resampled.get(pixel_count)
+        if frames is not None:
+            return frames
+
+        rgb = self._data
+        if self.channels == 4:
+            rgb = bytearray(len(self._data) // 4 * 3)
+            # Index a bytearray, since memoryview items are str on Python 2
+            rgba = bytearray(self._data)
+            for x in range(len(rgb) // 3):
+                alpha = rgba[x * 4 + 3]
+                rgb[x * 3] = rgba[x * 4] * alpha // 255
+                rgb[x * 3 + 1] = rgba[x * 4 + 1] * alpha // 255
+                rgb[x * 3 + 2] = rgba[x * 4 + 2] * alpha // 255
+        rgb = rgb.tobytes() if isinstance(rgb, memoryview) else bytes(rgb)
+
+        src_stride = self.width * 3
+        dst_stride = pixel_count * 3
+        repeats = pixel_count // self.width + 1
+        data = bytearray(self.height * dst_stride)
+        for y in range(self.height):
+            row = rgb[y * src_stride:(y + 1) * src_stride]
+            data[y * dst_stride:(y + 1) * dst_stride] = (row * repeats)[0:dst_stride]
+
+        frames = Pattern(pixel_count, self.height, 3, data, self.mtime)
+        self._resampled[pixel_count] = frames
+        return frames
+
+
+def decode_png(filename):
+    """Decode a PNG file into a Pattern.
+
+    Palette, greyscale and 16-bit images are converted to 8-bit RGB or RGBA.
+
+    :param filename: Path to the PNG file
+
+    """
+    import png
+
+    reader = png.Reader(filename=filename)
+    width, height, rows, meta = reader.read()
+    if meta['alpha']:
+        width, height, rows, meta = png.Reader(filename=filename).asRGBA8()
+        channels = 4
+    else:
+        width, height, rows, meta = png.Reader(filename=filename).asRGB8()
+        channels = 3
+
+    data = bytearray()
+    for row in rows:
+        data += bytearray(row)
+
+    return Pattern(width, height, channels, data, os.stat(filename).st_mtime)
+
+
+def write_png(filename, pattern):
+    """Write a Pattern to a PNG file, one row per frame.
+
+    :param filename: Path to the PNG file
+    :param pattern: Pattern to write
+
+    """
+    import png
+
+    stride = pattern.width * pattern.channels
+    data = pattern.get_data()
+    rows = (bytearray(data[y * stride:(y + 1) * stride]) for y in range(pattern.height))
+    writer = png.Writer(pattern.width, pattern.height, greyscale=False, alpha=pattern.channels == 4)
+    with open(filename, 'wb') as f:
+        writer.write(f, rows)
+
+
+def write_frames(filename, pattern):
+    """Write a Pattern to a pre-decoded frames file.
+
+    :param filename: Path to the frames file
+    :param pattern: Pattern to write
+
+    """
+    # Written alongside and renamed into place, since the old file may be memory-mapped
+    fd, temp = tempfile.mkstemp(prefix='.', suffix=FRAMES_EXT, dir=os.path.dirname(filename) or '.')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, pattern.width, pattern.height, pattern.channels, pattern.mtime))
+            f.write(pattern.get_data())
+        os.chmod(temp, 0o644)
+        os.rename(temp, filename)
+    except Exception:
+        os.remove(temp)
+        raise
+
+
+def read_frames(filename, mtime=None):
+    """Memory-map a pre-decoded frames file as a Pattern.
+
+    Returns None if the file is missing, invalid, or was decoded from a
+    source with a different mtime.
+
+    :param filename: Path to the frames file
+    :param mtime: Expected mtime of the source PNG, or None to accept any
+
+    """
+    try:
+        with open(filename, 'rb') as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (IOError, OSError, ValueError):
+        return None
+
+    if len(data) < _HEADER.size:
+        return None
+
+    magic, version, width, height, channels, source_mtime = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != _VERSION:
+        return None
+    if mtime is not None and source_mtime != mtime:
+        return None
+    if len(data) != _HEADER.size + width * height * channels:
+        return None
+
+    try:
+        data = memoryview(data)[_HEADER.size:]
+    except TypeError:
+        # Python 2 mmap has no memoryview support, so read it into memory instead
+        data = bytearray(data[_HEADER.size:])
+    return Pattern(width, height, channels, data, source_mtime)
+
+
+class PatternCache(object):
+    """Least recently used cache of decoded patterns.
+
+    Patterns are keyed by filename and reloaded when the file's mtime
+    changes. With persist enabled, decoded patterns are also written to a
+    frames file next to the PNG and memory-mapped on subsequent loads.
+
+    """
+
+    def __init__(self, max_size=DEFAULT_CACHE_SIZE, persist=False):
+        self._max_size = max_size
+        self._persist = persist
+        self._patterns = collections.OrderedDict()
+
+    def load(self, filename):
+        """Return the Pattern for a PNG or frames file, decoding it only if necessary.
+
+        :param filename: Path to the PNG or frames file
+
+        """
+        mtime = os.stat(filename).st_mtime
+        pattern = self._patterns.pop(filename, None)
+        if pattern is not None and pattern.mtime != mtime:
+            pattern = None
+
+        if pattern is None and filename.endswith(FRAMES_EXT):
+            pattern = read_frames(filename)
+            if pattern is None:
+                raise ValueError('Invalid frames file: {}'.format(filename))
+            # Track the frames file itself, rather than the PNG it may have come from
+            pattern.mtime = mtime
+
+        frames_file = os.path.splitext(filename)[0] + FRAMES_EXT
+        if pattern is None and self._persist:
+            pattern = read_frames(frames_file, mtime)
+
+        if pattern is None:
+            pattern = decode_png(filename)
+            if self._persist:
+                try:
+                    write_frames(frames_file, pattern)
+                except (IOError, OSError):
+                    pass
+
+        self._patterns[filename] = pattern
+        # Sizes are summed each time since patterns grow as they are resampled
+        size = sum(p.get_size() for p in self._patterns.values())
+        while size > self._max_size and len(self._patterns) > 1:
+            _, evicted = self._patterns.popitem(last=False)
+            size -= evicted.get_size()
+
+        return pattern
+
+    def clear(self):
+        """Forget all cached patterns."""
+        self._patterns.clear()
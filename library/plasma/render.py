@@ -0,0 +1,132 @@
+import importlib
+import sys
+
+from .pattern import FRAMES_EXT, Pattern, write_frames, write_png
+
+# Rows per second at which the daemon plays back patterns
+DEFAULT_FPS = 60
+
+
+def render(effect, pixel_count, duration, fps=DEFAULT_FPS, loop=None, tolerance=0):
+    """Render an effect into a Pattern, one row per frame.
+
+    The effect may be anything with a render_into(buffer, delta) method,
+    such as a plasmafx Sequence, which is given a packed RGB buffer to fill.
+    Otherwise it is called as effect(t) and should return packed RGB data
+    or a NumPy array of shape (N, 3) for pixel_count pixels.
+
+    Frames are rendered at times 0, 1 / fps, 2 / fps and so on.
+
+    :param effect: Effect to render
+    :param pixel_count: Number of pixels in each frame
+    :param duration: Seconds to render
+    :param fps: Frames per second, should match the playback rate
+    :param loop: Loop length in seconds, True to detect the loop from the frames, or None to keep every frame
+    :param tolerance: Largest per-channel difference allowed when detecting a loop
+
+    """
+    if loop is not None and loop is not True:
+        duration = loop
+    frame_count = max(1, int(round(duration * fps)))
+    frame_size = pixel_count * 3
+
+    data = bytearray(frame_count * frame_size)
+    buffer = bytearray(frame_size)
+    for frame in range(frame_count):
+        t = frame / float(fps)
+        if hasattr(effect, 'render_into'):
+            effect.render_into(buffer, t)
+            result = buffer
+        else:
+            result = effect(t)
+            if hasattr(result, 'shape') and not isinstance(result, memoryview):
+                import numpy
+                result = numpy.clip(result, 0, 255).astype(numpy.uint8).tobytes()
+        data[frame * frame_size:(frame + 1) * frame_size] = bytearray(result[:frame_size])
+
+    pattern = Pattern(pixel_count, frame_count, 3, data)
+    if loop is True:
+        length = find_loop(pattern, tolerance)
+        if length is not None:
+            pattern = Pattern(pixel_count, length, 3, data[:length * frame_size])
+    return pattern
+
+
+def find_loop(pattern, tolerance=0):
+    """Return the number of frames after which a pattern repeats, or None.
+
+    A loop is found where a frame and the one after it match the first two
+    frames, so playing that many frames on repeat wraps seamlessly.
+
+    :param pattern: Pattern to search
+    :param tolerance: Largest per-channel difference to treat as a match
+
+    """
+    first = pattern.get_row(0).tobytes()
+    second = pattern.get_row(1 % pattern.height).tobytes()
+    for length in range(2, pattern.height):
+        if _matches(pattern.get_row(length), first, tolerance):
+            after = pattern.get_row(length + 1) if length + 1 < pattern.height else None
+            if after is None or _matches(after, second, tolerance):
+                return length
+    return None
+
+
+def _matches(row, other, tolerance):
+    row = row.tobytes()
+    if not tolerance:
+        return row == other
+    return max(abs(a - b) for a, b in zip(bytearray(row), bytearray(other))) <= tolerance
+
+
+def save(filename, pattern):
+    """Save a Pattern as a PNG, or as a frames file if filename ends in FRAMES_EXT.
+
+    Either can be installed into the daemon's pattern directory.
+
+    :param filename: Path to the output file
+    :param pattern: Pattern to save
+
+    """
+    if filename.endswith(FRAMES_EXT):
+        write_frames(filename, pattern)
+    else:
+        write_png(filename, pattern)
+
+
+def _load_effect(spec):
+    module_name, _, attrs = spec.partition(':')
+    effect = importlib.import_module(module_name)
+    for attr in attrs.split('.'):
+        if attr:
+            effect = getattr(effect, attr)
+    return effect
+
+
+def main(args):
+    """Render an effect given as module:attr to a pattern file."""
+    from optparse import OptionParser
+
+    parser = OptionParser(usage='python -m plasma.render [options] <module:effect> <output.png|output.frames>')
+    parser.add_option('-p', '--pixels', type='int', default=40, help='set number of pixels to render')
+    parser.add_option('-d', '--duration', type='float', default=10.0, help='set seconds to render')
+    parser.add_option('-f', '--fps', type='int', default=DEFAULT_FPS,
+                      help='set frames per second, the daemon plays patterns at {}'.format(DEFAULT_FPS))
+    parser.add_option('-l', '--loop', type='float', default=None, help='set loop length in seconds, replaces --duration')
+    parser.add_option('--detect-loop', action='store_true', default=False,
+                      help='trim the output to the first detected loop')
+    parser.add_option('-t', '--tolerance', type='int', default=0,
+                      help='set per-channel difference allowed when detecting a loop')
+    opts, args = parser.parse_args(args)
+    if len(args) != 2:
+        parser.error('expected an effect and an output file')
+
+    loop = opts.loop if opts.loop is not None else True if opts.detect_loop else None
+    pattern = render(_load_effect(args[0]), opts.pixels, opts.duration, opts.fps, loop, opts.tolerance)
+    save(args[1], pattern)
+    print('Rendered {} frames of {} pixels to {}'.format(pattern.height, pattern.width, args[1]))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,110 @@
+import time
+
+try:
+    _monotonic = time.monotonic
+except AttributeError:
+    _monotonic = time.time
+
+
+class FrameScheduler(object):
+    """Deadline based frame pacing.
+
+    Frames are scheduled at absolute times on a monotonic clock, so time
+    spent rendering and outputting a frame does not slow the frame rate.
+    If a frame starts one or more whole frames late, the missed frames are
+    skipped rather than rendered in a burst to catch up.
+
+    """
+
+    def __init__(self, fps, clock=_monotonic):
+        self._clock = clock
+        self._frames = 0
+        self._skipped = 0
+        self._overruns = 0
+        self._render_time = 0
+        self._output_time = 0
+        self._window_start = clock()
+        self._window_frames = 0
+        self._achieved_fps = 0
+        self.set_fps(fps)
+
+    def set_fps(self, fps):
+        """Set the target frame rate, restarting the schedule from now.
+
+        :param fps: Frames per second
+
+        """
+        if fps <= 0:
+            raise ValueError('FPS should be greater than 0')
+        self._fps = fps
+        self._interval = 1.0 / fps
+        self._next = None
+
+    def get_fps(self):
+        return self._fps
+
+    def get_timeout(self):
+        """Return the time in seconds until the next frame is due."""
+        if self._next is None:
+            return 0
+        return max(0, self._next - self._clock())
+
+    def tick(self):
+        """Start a frame and return the time it was scheduled for.
+
+        Call once the timeout from get_timeout has elapsed.
+
+        """
+        now = self._clock()
+        if self._next is None:
+            self._next = now
+
+        late = now - self._next
+        if late >= self._interval:
+            skipped = int(late / self._interval)
+            self._skipped += skipped
+            self._next += skipped * self._interval
+
+        frame_time = self._next
+        self._next += self._interval
+        self._frames += 1
+
+        self._window_frames += 1
+        elapsed = now - self._window_start
+        if elapsed >= 1.0:
+            self._achieved_fps = self._window_frames / elapsed
+            self._window_start = now
+            self._window_frames = 0
+
+        return frame_time
+
+    def record(self, render_time, output_time):
+        """Record how long the current frame took to render and output.
+
+        :param render_time: Seconds spent rendering the frame
+        :param output_time: Seconds spent outputting the frame
+
+        """
+        # Exponential moving averages, weighted towards recent frames
+        self._render_time += (render_time - self._render_time) * 0.1
+        self._output_time += (output_time - self._output_time) * 0.1
+        if render_time + output_time > self._interval:
+            self._overruns += 1
+
+    def get_stats(self):
+        """Return a dictionary of frame timing statistics.
+
+        Times are averages in milliseconds. Overruns are frames that took
+        longer than one frame interval, skipped are frames dropped to
+        catch up after falling behind.
+
+        """
+        return {
+            'fps': self._fps,
+            'achieved_fps': round(self._achieved_fps, 2),
+            'frames': self._frames,
+            'skipped': self._skipped,
+            'overruns': self._overruns,
+            'render_ms': round(self._render_time * 1000, 3),
+            'output_ms': round(self._output_time * 1000, 3)
+        }
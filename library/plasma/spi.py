@@ -0,0 +1,37 @@
+from .core import Plasma
+from .apa102 import APA102Encoder
+
+
+class PlasmaSPI(Plasma):
+    def __init__(self, light_count, bus=0, device=0, max_speed_hz=4000000, spidev=None):
+        self._spidev = spidev
+        if self._spidev is None:
+            import spidev
+            self._spidev = spidev
+
+        self._spi_bus = bus
+        self._spi_device = device
+        self._spi_max_speed_hz = max_speed_hz
+        self._spi = None
+        Plasma.__init__(self, light_count)
+        self._encoder = APA102Encoder(self.get_pixel_count())
+
+    def _resize(self, old_pixel_count, pixel_count):
+        self._encoder.resize(pixel_count)
+
+    def _show(self, pixels, dirty):
+        """Output the buffer."""
+        if self._spi is None:
+            self._spi = self._spidev.SpiDev()
+            self._spi.open(self._spi_bus, self._spi_device)
+            self._spi.max_speed_hz = self._spi_max_speed_hz
+            self._spi.mode = 0
+
+        if dirty is not None:
+            self._encoder.encode(pixels, *dirty)
+
+        frame = self._encoder.frame
+        if hasattr(self._spi, 'writebytes2'):
+            self._spi.writebytes2(frame)
+        else:
+            self._spi.writebytes(list(frame))
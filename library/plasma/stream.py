@@ -0,0 +1,104 @@
+import errno
+import os
+import socket
+
+from .core import MAX_BRIGHTNESS
+
+# Maps an alpha value onto the coarse brightness levels of the LEDs
+_ALPHA_TO_BRIGHTNESS = bytes(bytearray((x * MAX_BRIGHTNESS + 127) // 255 for x in range(256)))
+
+
+class FrameStream(object):
+    """Receive raw frames from clients on a Unix domain socket.
+
+    Clients write frames of packed 8-bit RGB (or RGBA) pixel data, one
+    after another with no framing. Only the newest complete frame is kept,
+    older ones are dropped, so a fast producer never builds up latency.
+
+    """
+
+    def __init__(self, path, pixel_count, channels=3):
+        if channels not in (3, 4):
+            raise ValueError('Channels should be 3 or 4')
+        self._path = path
+        self._channels = channels
+        self._frame_size = pixel_count * channels
+        self._connections = {}
+
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+        self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._listener.bind(path)
+        self._listener.listen(5)
+        self._listener.setblocking(False)
+
+    def get_frame_size(self):
+        return self._frame_size
+
+    def set_pixel_count(self, pixel_count):
+        """Change the expected frame size, discarding any partially received frames."""
+        self._frame_size = pixel_count * self._channels
+        for buf in self._connections.values():
+            del buf[:]
+
+    def read(self):
+        """Return the newest complete frame received since the last call, or None.
+
+        Never blocks. The result can be passed to Plasma.set_from_array along
+        with get_channels. For RGBA frames the alpha channel is converted to
+        the LEDs' raw brightness.
+
+        """
+        self._accept()
+
+        frame = None
+        for sock, buf in list(self._connections.items()):
+            while True:
+                try:
+                    data = sock.recv(65536)
+                except socket.error as e:
+                    if e.errno not in (errno.EAGAIN, errno.EWOULDBLOCK):
+                        data = b''
+                    else:
+                        break
+                if not data:
+                    del self._connections[sock]
+                    sock.close()
+                    break
+                buf += data
+
+            complete = len(buf) // self._frame_size * self._frame_size
+            if complete:
+                frame = buf[complete - self._frame_size:complete]
+                del buf[:complete]
+
+        if frame is not None and self._channels == 4:
+            frame[3::4] = frame[3::4].translate(_ALPHA_TO_BRIGHTNESS)
+        return frame
+
+    def get_channels(self):
+        return self._channels
+
+    def _accept(self):
+        while True:
+            try:
+                sock, _ = self._listener.accept()
+            except socket.error:
+                return
+            sock.setblocking(False)
+            self._connections[sock] = bytearray()
+
+    def close(self):
+        for sock in self._connections:
+            sock.close()
+        self._connections = {}
+        self._listener.close()
+        os.remove(self._path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, e_type, e_value, traceback):
+        self.close()
@@ -1,22 +1,33 @@
 from .core import Plasma
 from serial import Serial
 
+SOF = b'LEDS'
+EOF = b'\x00\x00\x00\xff'
+
 
 class PlasmaSerial(Plasma):
-    def __init__(self, light_count, port='/dev/ttyAMA0', baudrate=115200):
+    def __init__(self, light_count, port='/dev/ttyAMA0', baudrate=115200, flush=True):
         self._serial_port = port
         self._serial = Serial(port, baudrate=baudrate)
+        self._flush = flush
+        # Preassembled serial frame, the pixels are copied in before each write
+        self._frame = bytearray(SOF + EOF)
         Plasma.__init__(self, light_count)
 
-    def show(self):
-        """Display current buffer on LEDs."""
-        sof = b"LEDS"
-        eof = b"\x00\x00\x00\xff"
+    def set_flush(self, flush=True):
+        """Set whether show should wait for each frame to be transmitted.
+
+        Disabling flush lets USB transfers overlap with rendering the next frame.
 
-        pixels = []
-        for pixel in self._pixels:
-            for channel in pixel:
-                pixels += [channel]
+        :param flush: True or False (default True)
 
-        self._serial.write(sof + bytearray(pixels) + eof)
-        self._serial.flush()
+        """
+        self._flush = flush
+
+    def _show(self, pixels, dirty):
+        """Display current buffer on LEDs."""
+        frame = self._frame
+        frame[len(SOF):len(frame) - len(EOF)] = pixels
+        self._serial.write(frame)
+        if self._flush:
+            self._serial.flush()
@@ -1,10 +1,9 @@
-import time
-from .core import Plasma
+from .core import Plasma, BYTES_PER_PIXEL
 
 
 class PlasmaWS281X(Plasma):
     def __init__(self, light_count, gpio_pin=13, strip_type='WS2812', channel=1, brightness=255, freq_hz=800000, dma=10, invert=False):
-        from rpi_ws281x import PixelStrip, ws
+        from rpi_ws281x import ws
 
         strip_types = {}
         for t in ws.__dict__:
@@ -13,16 +12,35 @@ class PlasmaWS281X(Plasma):
                 v = getattr(ws, t)
                 strip_types[k] = v
 
-        strip_type = strip_types[strip_type]
-        self._strip = PixelStrip(light_count, gpio_pin, freq_hz, dma, invert, brightness, channel, strip_type)
-        self._strip.begin()
+        self._strip_args = (gpio_pin, freq_hz, dma, invert, brightness, channel, strip_types[strip_type])
+        self._strip = None
+        self._begin(light_count)
 
         Plasma.__init__(self, light_count)
 
-    def show(self):
+    def _begin(self, light_count):
+        from rpi_ws281x import PixelStrip
+        if self._strip is not None:
+            # Release the old strip's DMA and PWM before claiming them again
+            self._strip._cleanup()
+        self._strip = PixelStrip(light_count, *self._strip_args)
+        self._strip.begin()
+
+    def _resize(self, old_pixel_count, pixel_count):
+        light_count = self.get_light_count()
+        if light_count > self._strip.numPixels():
+            self._begin(light_count)
+            return
+
+        # Shrinking keeps the existing strip, just blank the pixels no longer used
+        for i in range(light_count, self._strip.numPixels()):
+            self._strip.setPixelColorRGB(i, 0, 0, 0)
+
+    def _show(self, pixels, dirty):
         """Output the buffer."""
-        for i in range(self._strip.numPixels()):
-            r, g, b, brightness = self._pixels[i]
+        for i in range(min(self._strip.numPixels(), self.get_light_count())):
+            offset = i * BYTES_PER_PIXEL
+            r, g, b, brightness = pixels[offset:offset + BYTES_PER_PIXEL]
             self._strip.setPixelColorRGB(i, r, g, b)
 
         self._strip.show()
@@ -0,0 +1,24 @@
+"""Test the APA102 frame encoder."""
+from tools import spidev
+
+
+def test_encode():
+    """Test pixels are encoded as brightness, blue, green, red words."""
+    from plasma.apa102 import APA102Encoder
+    encoder = APA102Encoder(2)
+    encoder.encode(bytearray([1, 2, 3, 31, 4, 5, 6, 0]))
+
+    assert encoder.frame == bytearray(b'\x00' * 4 + b'\xff\x03\x02\x01\xe0\x06\x05\x04' + b'\x00' * 5)
+    assert bytes(encoder.get_pixel_data()) == b'\xff\x03\x02\x01\xe0\x06\x05\x04'
+
+
+def test_dirty_range():
+    """Test only pixels changed since the last show are re-encoded."""
+    from plasma.spi import PlasmaSPI
+    plasma = PlasmaSPI(2, spidev=spidev())
+    plasma.show()
+    assert plasma._take_dirty() is None
+
+    plasma.set_pixel(5, 1, 2, 3)
+    plasma.set_light(0, 1, 2, 3)
+    assert plasma._take_dirty() == (0, 6)
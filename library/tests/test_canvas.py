@@ -0,0 +1,57 @@
+"""Test the multi-device canvas."""
+import pytest
+
+from tools import spidev
+
+
+def _device(light_count):
+    from plasma.spi import PlasmaSPI
+    module = spidev()
+    device = PlasmaSPI(light_count, spidev=module)
+    device.spidev = module
+    return device
+
+
+def test_segments():
+    """Test canvas pixels are mapped onto devices with offsets and reversal."""
+    from plasma.canvas import PlasmaCanvas
+    first = _device(1)
+    second = _device(2)
+    canvas = PlasmaCanvas([(first,), (second, 2, 4, True)], concurrent=False)
+    assert canvas.get_pixel_count() == 8
+
+    canvas.set_pixels([(x, x, x) for x in range(8)])
+    canvas.show()
+
+    assert [first.get_pixel(x)[0] for x in range(4)] == [0, 1, 2, 3]
+    assert [second.get_pixel(x)[0] for x in range(8)] == [0, 0, 7, 6, 5, 4, 0, 0]
+    assert len(first.spidev.devices[0].transfers) == 1
+
+
+def test_segment_offset():
+    """Test a (device, offset) segment uses the rest of the device."""
+    from plasma.canvas import PlasmaCanvas
+    device = _device(2)
+    canvas = PlasmaCanvas([(device, 4)], concurrent=False)
+    assert canvas.get_pixel_count() == 4
+
+    canvas.set_pixel(0, 9, 9, 9)
+    canvas.show()
+    assert device.get_pixel(4)[0:3] == (9, 9, 9)
+
+    with pytest.raises(TypeError):
+        canvas.set_light_count(8)
+
+
+def test_concurrent():
+    """Test devices are output by their writer threads."""
+    from plasma.canvas import PlasmaCanvas
+    first = _device(1)
+    second = _device(1)
+    canvas = PlasmaCanvas([(first,), (second,)])
+    canvas.set_all(255, 0, 0)
+    canvas.show()
+    canvas.atexit()
+
+    assert first.spidev.devices[0].transfers[0][4:8] == b'\xe3\x00\x00\xff'
+    assert second.spidev.devices[0].transfers[0][4:8] == b'\xe3\x00\x00\xff'
@@ -0,0 +1,48 @@
+"""Test HSV colour conversion."""
+import colorsys
+
+import pytest
+
+
+def _expected(hues, s, v):
+    return bytearray(int(c * 255) for h in hues for c in colorsys.hsv_to_rgb(h, s, v))
+
+
+def test_hsv_to_rgb_array():
+    """Test the lookup table matches colorsys."""
+    from plasma.colour import hsv_to_rgb_array, HUE_STEPS
+    hues = [x / float(HUE_STEPS) for x in range(0, HUE_STEPS, 7)]
+
+    assert hsv_to_rgb_array(hues) == _expected(hues, 1.0, 1.0)
+    assert hsv_to_rgb_array(hues, 0.5, 0.25) == _expected(hues, 0.5, 0.25)
+
+
+def test_hsv_to_rgb_array_numpy():
+    """Test the NumPy conversion matches colorsys."""
+    numpy = pytest.importorskip('numpy')
+    from plasma.colour import hsv_to_rgb_array
+    hues = [x / 97.0 for x in range(97)]
+    result = hsv_to_rgb_array(numpy.array(hues), 0.75, 0.5)
+
+    assert result.shape == (97, 3)
+    assert bytearray(result.tobytes()) == _expected(hues, 0.75, 0.5)
+
+
+def test_correction():
+    """Test gamma, white balance and dimming are applied at output only."""
+    from plasma.spi import PlasmaSPI
+    from tools import spidev
+    module = spidev()
+    plasma = PlasmaSPI(1, spidev=module)
+    plasma.set_all(255, 128, 255)
+    plasma.set_gamma(2.0)
+    plasma.set_white_balance(1.0, 1.0, 0.5)
+    plasma.set_dimming(0.5)
+    plasma.show()
+
+    assert plasma.get_pixel(0) == (255, 128, 255, 1.0)
+    assert module.devices[0].transfers[-1][4:8] == b'\xe3\x40\x20\x80'
+
+    plasma.set_dimming(1.0)
+    plasma.show()
+    assert module.devices[0].transfers[-1][4:8] == b'\xe3\x80\x40\xff'
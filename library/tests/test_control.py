@@ -0,0 +1,75 @@
+"""Test the daemon control channel."""
+import os
+import socket
+
+import pytest
+
+
+def test_fifo_partial_lines(tmpdir):
+    """Test partial commands are buffered and several are read at once."""
+    from plasma.control import ControlChannel
+    path = str(tmpdir.join('plasma'))
+    with ControlChannel(path) as control:
+        fifo = os.open(path, os.O_WRONLY)
+        os.write(fifo, b'25')
+        assert control.poll(0.01) == []
+
+        os.write(fifo, b'5 0 0\nfps 60\n')
+        os.close(fifo)
+        assert control.poll(0.01) == [('255 0 0', None), ('fps 60', None)]
+        assert control.poll(0) == []
+
+
+def test_overlong_line():
+    """Test every part of an overlong line is dropped."""
+    from plasma.control import LineBuffer, MAX_LINE_LENGTH
+    buffer = LineBuffer()
+    assert buffer.feed(b'x' * MAX_LINE_LENGTH) == []
+    assert buffer.feed(b'x' * MAX_LINE_LENGTH) == []
+    assert buffer.feed(b'xx 255 0 0\nfps 5\n') == ['fps 5']
+    assert buffer.feed(b'x' * (MAX_LINE_LENGTH + 1) + b'\nfps 6\n') == ['fps 6']
+
+
+def test_socket(tmpdir):
+    """Test commands are read from socket clients."""
+    from plasma.control import ControlChannel
+    path = str(tmpdir.join('plasma.sock'))
+    with ControlChannel(str(tmpdir.join('plasma')), path) as control:
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.connect(path)
+        control.poll(0.01)
+
+        client.sendall(b'stats\nstop\n')
+        commands = control.poll(0.01)
+        assert [command for command, _ in commands] == ['stats', 'stop']
+        assert commands[0][1] is not None
+
+        client.close()
+        control.poll(0.01)
+        assert control._connections == []
+
+
+def test_client_batch(tmpdir):
+    """Test a batch of commands is answered in order."""
+    import threading
+    from plasma.client import PlasmaClient, ControlError
+    from plasma.control import ControlChannel
+    path = str(tmpdir.join('plasma.sock'))
+    with ControlChannel(str(tmpdir.join('plasma')), path) as control:
+        def serve():
+            answered = 0
+            while answered < 3:
+                for command, connection in control.poll(0.1):
+                    connection.reply('error Unknown' if command == 'bad' else 'ok ' + command.upper())
+                    answered += 1
+
+        server = threading.Thread(target=serve)
+        server.start()
+        with PlasmaClient(path) as client:
+            assert client.send('fps 60', 'bad') == ['ok FPS 60', 'error Unknown']
+            with pytest.raises(ControlError):
+                client.command('bad')
+            for commands in ([''], ['fps 5', ' '], ['fps 5\nfps 6']):
+                with pytest.raises(ValueError):
+                    client.send(*commands)
+        server.join()
@@ -0,0 +1,206 @@
+"""Test the Plasma pixel buffer."""
+import pytest
+from tools import GPIO, spidev
+
+
+def _plasma(light_count=2):
+    from plasma.gpio import PlasmaGPIO
+    return PlasmaGPIO(light_count, gpio=GPIO())
+
+
+def test_set_get_pixel():
+    """Test pixels are stored independently."""
+    plasma = _plasma()
+    plasma.set_pixel(0, 255, 128, 1)
+    plasma.set_pixel(7, 10, 20, 30, 1.0 / 3)
+
+    assert plasma.get_pixel(0) == (255, 128, 1, 1.0)
+    assert plasma.get_pixel(1) == (0, 0, 0, 1.0)
+    assert plasma.get_pixel(7) == (10, 20, 30, 0.333)
+
+
+def test_clear_keeps_brightness():
+    """Test clear blanks colour but not brightness."""
+    plasma = _plasma()
+    plasma.set_all(1, 2, 3)
+    plasma.set_brightness(0)
+    plasma.clear()
+
+    for x in range(plasma.get_pixel_count()):
+        assert plasma.get_pixel(x) == (0, 0, 0, 0.0)
+
+
+def test_set_range():
+    """Test a run of pixels is set and clipped to the chain."""
+    plasma = _plasma()
+    plasma.set_range(6, 20, 1, 2, 3, 0)
+
+    assert plasma.get_pixel(5) == (0, 0, 0, 1.0)
+    assert plasma.get_pixel(6) == (1, 2, 3, 0.0)
+    assert plasma.get_pixel(7) == (1, 2, 3, 0.0)
+
+
+def test_set_pixels():
+    """Test bulk setting from tuples and bytes."""
+    plasma = _plasma()
+    plasma.set_pixels([(1, 2, 3), (256, 5, 6)], offset=1)
+    plasma.set_from_array(b'\x07\x08\x09\x00' * 20, offset=6, channels=4)
+    plasma.set_from_array(memoryview(b'\x0a\x0b\x0c'), offset=3)
+
+    assert plasma.get_pixel(0) == (0, 0, 0, 1.0)
+    assert plasma.get_pixel(1) == (1, 2, 3, 1.0)
+    assert plasma.get_pixel(2) == (0, 5, 6, 1.0)
+    assert plasma.get_pixel(3) == (10, 11, 12, 1.0)
+    assert plasma.get_pixel(7) == (7, 8, 9, 0.0)
+
+
+def test_set_light_index():
+    """Test light indices wrap from the end and are checked."""
+    plasma = _plasma()
+    plasma.set_light(-1, 1, 2, 3)
+    assert plasma.get_pixel(4) == (1, 2, 3, 1.0)
+    assert plasma.get_pixel(3) == (0, 0, 0, 1.0)
+
+    with pytest.raises(IndexError):
+        plasma.set_light(2, 1, 2, 3)
+    with pytest.raises(ValueError):
+        plasma.set_from_array(b'\x01\x02\x03', offset=-1)
+
+
+def test_set_pixels_numpy():
+    """Test bulk setting from a NumPy array."""
+    numpy = pytest.importorskip('numpy')
+    plasma = _plasma()
+    frame = numpy.zeros((plasma.get_pixel_count(), 3), dtype=numpy.uint8)
+    frame[:, 0] = numpy.arange(plasma.get_pixel_count())
+    plasma.set_pixels(frame, brightness=0)
+
+    assert plasma.get_pixel(5) == (5, 0, 0, 0.0)
+
+
+def test_skip_unchanged():
+    """Test identical frames are only output once, unless a keepalive is due."""
+    from plasma.spi import PlasmaSPI
+    module = spidev()
+    plasma = PlasmaSPI(1, spidev=module)
+    plasma.set_all(255, 0, 0)
+    plasma.show()
+    plasma.set_pixel(0, 255, 0, 0)
+    plasma.show()
+    assert len(module.devices[0].transfers) == 1
+
+    plasma.set_keepalive(0)
+    plasma.show()
+    assert len(module.devices[0].transfers) == 2
+
+    plasma.set_keepalive(None)
+    plasma.set_skip_unchanged(False)
+    plasma.show()
+    assert len(module.devices[0].transfers) == 3
+
+
+def test_failed_show_is_retried():
+    """Test a frame that failed to output is not treated as sent."""
+    from plasma.core import Plasma
+
+    class Failing(Plasma):
+        sent = []
+        fail = True
+
+        def _show(self, pixels, dirty):
+            if self.fail:
+                raise IOError('write failed')
+            self.sent.append((bytes(pixels), dirty))
+
+    plasma = Failing(1)
+    plasma.fail = False
+    plasma.show()
+    plasma.fail = True
+    plasma.set_pixel(0, 1, 2, 3)
+    with pytest.raises(IOError):
+        plasma.show()
+
+    plasma.fail = False
+    plasma.show()
+    assert len(plasma.sent) == 2
+    assert plasma.sent[1][0][0:3] == b'\x01\x02\x03'
+    assert plasma.sent[1][1] == (0, 4)
+
+
+def test_async_drops_stale_frames():
+    """Test async output drops stale frames and always outputs the newest one."""
+    import time
+    from plasma.core import Plasma
+
+    class SlowPlasma(Plasma):
+        def __init__(self, light_count):
+            self.frames = []
+            Plasma.__init__(self, light_count)
+
+        def _show(self, pixels, dirty):
+            time.sleep(0.05)
+            self.frames.append(bytes(pixels))
+
+    plasma = SlowPlasma(1)
+    plasma.set_async()
+    for x in range(5):
+        plasma.set_pixel(0, x, 0, 0)
+        plasma.show()
+    plasma.set_async(False)
+
+    assert plasma.get_frames_dropped() > 0
+    assert len(plasma.frames) < 5
+    assert plasma.frames[-1][0:3] == b'\x04\x00\x00'
+
+
+def test_set_light_count():
+    """Test resizing keeps existing pixels and re-encodes output."""
+    from plasma.spi import PlasmaSPI
+    module = spidev()
+    plasma = PlasmaSPI(1, spidev=module)
+    plasma.set_all(1, 2, 3)
+    plasma.show()
+
+    plasma.set_light_count(2)
+    plasma.show()
+    assert plasma.get_pixel_count() == 8
+    assert plasma.get_pixel(3) == (1, 2, 3, 1.0)
+    assert plasma.get_pixel(4) == (0, 0, 0, 1.0)
+    assert len(module.devices[0].transfers[-1]) == 4 + 8 * 4 + 5
+
+    plasma.set_light_count(0)
+    plasma.show()
+    assert module.devices[0].transfers[-1] == b'\x00' * 9
+
+
+def test_set_light_count_serial():
+    """Test resizing resizes the serial frame."""
+    import os
+    pytest.importorskip('serial')
+    from plasma.usb import PlasmaSerial
+    master, slave = os.openpty()
+    try:
+        plasma = PlasmaSerial(1, port=os.ttyname(slave), flush=False)
+        plasma.set_all(1, 2, 3)
+        plasma.set_light_count(2)
+        assert plasma.get_pixel(3) == (1, 2, 3, 1.0)
+        plasma.show()
+
+        expected = b'LEDS' + b'\x01\x02\x03\x03' * 4 + b'\x00\x00\x00\x03' * 4 + b'\x00\x00\x00\xff'
+        received = b''
+        while len(received) < len(expected):
+            received += os.read(master, len(expected))
+        assert received == expected
+    finally:
+        os.close(master)
+        os.close(slave)
+
+
+def test_get_pixel_index():
+    """Test negative indices count from the end and others are checked."""
+    plasma = _plasma()
+    plasma.set_pixel(7, 1, 2, 3)
+
+    assert plasma.get_pixel(-1) == (1, 2, 3, 1.0)
+    with pytest.raises(IndexError):
+        plasma.get_pixel(8)
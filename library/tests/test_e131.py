@@ -0,0 +1,76 @@
+"""Test the E1.31 receiver."""
+import socket
+import struct
+import time
+
+
+def _data_packet(universe, data, sequence=0, sync_address=0):
+    dmp = struct.pack('!HBBHHH', 0x7000 | (10 + 1 + len(data)), 0x02, 0xa1, 0, 1, 1 + len(data)) + b'\x00' + data
+    framing = struct.pack('!HI64sBHBBH', 0x7000 | (77 + len(dmp)), 0x00000002, b'test', 100, sync_address, sequence, 0, universe)
+    root = struct.pack('!HH12sHI16s', 0x0010, 0, b'ASC-E1.17\x00\x00\x00', 0x7000 | (22 + len(framing) + len(dmp)), 0x00000004, b'\x00' * 16)
+    return root + framing + dmp
+
+
+def _sync_packet(sync_address, sequence=0):
+    framing = struct.pack('!HIBHH', 0x7000 | 11, 0x00000001, sequence, sync_address, 0)
+    root = struct.pack('!HH12sHI16s', 0x0010, 0, b'ASC-E1.17\x00\x00\x00', 0x7000 | (22 + len(framing)), 0x00000008, b'\x00' * 16)
+    return root + framing
+
+
+def _receiver(plasma, **kwargs):
+    from plasma.e131 import E131Receiver
+    return E131Receiver(plasma, address='127.0.0.1', port=0, multicast=False, **kwargs)
+
+
+def _plasma(light_count):
+    from plasma.core import Plasma
+
+    class RecordingPlasma(Plasma):
+        def __init__(self, light_count):
+            self.shows = 0
+            Plasma.__init__(self, light_count)
+
+        def _show(self, pixels, dirty):
+            self.shows += 1
+
+    return RecordingPlasma(light_count)
+
+
+def _send(receiver, *packets):
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    for packet in packets:
+        sender.sendto(packet, receiver.get_address())
+    sender.close()
+    time.sleep(0.01)
+
+
+def test_universes():
+    """Test pixels span universes and are shown once per poll."""
+    plasma = _plasma(50)
+    with _receiver(plasma, universe=3, pixels_per_universe=100) as receiver:
+        _send(receiver,
+              _data_packet(3, b'\x01\x02\x03' * 100),
+              _data_packet(4, b'\x04\x05\x06' * 100),
+              _data_packet(7, b'\xff' * 300))
+        assert receiver.poll(0.1) == 2
+
+    assert plasma.get_pixel(99)[0:3] == (1, 2, 3)
+    assert plasma.get_pixel(100)[0:3] == (4, 5, 6)
+    assert plasma.shows == 1
+
+
+def test_sync():
+    """Test synchronised data is only shown on the sync packet."""
+    plasma = _plasma(1)
+    with _receiver(plasma, channel=4) as receiver:
+        _send(receiver, _data_packet(1, b'\x00\x00\x00' + b'\x09' * 12, sequence=1, sync_address=10))
+        receiver.poll(0.1)
+        assert plasma.get_pixel(3)[0:3] == (9, 9, 9)
+        assert plasma.shows == 0
+
+        _send(receiver, _data_packet(1, b'\x00' * 15, sequence=0))
+        assert receiver.poll(0.1) == 0
+
+        _send(receiver, _sync_packet(10))
+        receiver.poll(0.1)
+        assert plasma.shows == 1
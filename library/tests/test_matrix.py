@@ -0,0 +1,71 @@
+"""Test 2D matrix mapping."""
+import pytest
+from tools import GPIO
+
+
+def _plasma(light_count=4):
+    from plasma.gpio import PlasmaGPIO
+    return PlasmaGPIO(light_count, gpio=GPIO())
+
+
+def _reds(plasma, count):
+    return [plasma.get_pixel(x)[0] for x in range(count)]
+
+
+def test_serpentine():
+    """Test odd rows run backwards with serpentine wiring."""
+    from plasma.matrix import PlasmaMatrix
+    plasma = _plasma()
+    matrix = PlasmaMatrix(plasma, 3, 2, serpentine=True, offset=1)
+    matrix.set_xy(0, 1, 255, 0, 0)
+
+    assert matrix.get_index(0, 1) == 6
+    assert plasma.get_pixel(6)[0] == 255
+
+
+@pytest.mark.parametrize('x, y', [(2, 0), (0, 2), (-1, 0), (0, -1)])
+def test_bounds(x, y):
+    """Test coordinates outside the grid are rejected."""
+    from plasma.matrix import PlasmaMatrix
+    matrix = PlasmaMatrix(_plasma(), 2, 2)
+    with pytest.raises(IndexError):
+        matrix.set_xy(x, y, 255, 0, 0)
+
+
+@pytest.mark.parametrize('kwargs, expected', [
+    ({}, [1, 2, 3, 4, 5, 6]),
+    ({'serpentine': True}, [1, 2, 3, 6, 5, 4]),
+    ({'flip_x': True}, [3, 2, 1, 6, 5, 4]),
+    ({'flip_y': True}, [4, 5, 6, 1, 2, 3]),
+    ({'rotation': 180}, [6, 5, 4, 3, 2, 1]),
+])
+def test_set_array(kwargs, expected):
+    """Test whole frames are remapped onto the chain."""
+    from plasma.matrix import PlasmaMatrix
+    plasma = _plasma()
+    matrix = PlasmaMatrix(plasma, 3, 2, **kwargs)
+    matrix.set_array(bytearray(c for x in range(1, 7) for c in (x, 0, 0)))
+
+    assert _reds(plasma, 6) == expected
+
+
+def test_rotation():
+    """Test rotated grids swap width and height and match set_xy."""
+    numpy = pytest.importorskip('numpy')
+    from plasma.matrix import PlasmaMatrix
+    for rotation in (90, 270):
+        plasma = _plasma()
+        matrix = PlasmaMatrix(plasma, 3, 2, serpentine=True, rotation=rotation)
+        assert matrix.get_shape() == (2, 3)
+
+        frame = numpy.zeros((3, 2, 3), dtype=numpy.uint8)
+        frame[:, :, 0] = numpy.arange(1, 7).reshape(3, 2)
+        matrix.set_array(frame)
+        for y in range(3):
+            for x in range(2):
+                assert matrix.get_xy(x, y)[0] == frame[y, x, 0]
+
+        matrix.set_array(frame.tobytes())
+        for y in range(3):
+            for x in range(2):
+                assert matrix.get_xy(x, y)[0] == frame[y, x, 0]
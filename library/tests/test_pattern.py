@@ -0,0 +1,81 @@
+"""Test pattern decoding and caching."""
+import os
+
+import pytest
+
+
+def _write_png(filename, width, rows):
+    png = pytest.importorskip('png')
+    with open(filename, 'wb') as f:
+        png.Writer(width, len(rows), greyscale=False).write(f, rows)
+
+
+def test_decode_png(tmpdir):
+    """Test a PNG is decoded into contiguous rows."""
+    from plasma.pattern import decode_png
+    filename = str(tmpdir.join('test.png'))
+    _write_png(filename, 2, [[1, 2, 3, 4, 5, 6], [7, 8, 9, 10, 11, 12]])
+    pattern = decode_png(filename)
+
+    assert (pattern.width, pattern.height, pattern.channels) == (2, 2, 3)
+    assert bytes(pattern.get_row(1)) == b'\x07\x08\x09\x0a\x0b\x0c'
+
+
+def test_cache_persist(tmpdir):
+    """Test decoded patterns are cached in memory and on disk."""
+    from plasma.pattern import PatternCache
+    filename = str(tmpdir.join('test.png'))
+    _write_png(filename, 1, [[1, 2, 3]])
+
+    cache = PatternCache(persist=True)
+    pattern = cache.load(filename)
+    assert cache.load(filename) is pattern
+    assert os.path.isfile(str(tmpdir.join('test.frames')))
+
+    pattern = PatternCache(persist=True).load(filename)
+    assert bytes(pattern.get_data()) == b'\x01\x02\x03'
+
+    os.utime(filename, (0, 0))
+    assert cache.load(filename) is not pattern
+
+
+def test_cache_evicts(tmpdir):
+    """Test the least recently used pattern is evicted when over size."""
+    from plasma.pattern import PatternCache
+    cache = PatternCache(max_size=3)
+    first = str(tmpdir.join('first.png'))
+    second = str(tmpdir.join('second.png'))
+    _write_png(first, 1, [[1, 2, 3]])
+    _write_png(second, 1, [[4, 5, 6]])
+
+    pattern = cache.load(first)
+    cache.load(second)
+    assert cache.load(first) is not pattern
+
+
+def test_resample():
+    """Test rows are repeated across the chain and alpha is applied."""
+    from plasma.pattern import Pattern
+    pattern = Pattern(2, 2, 4, bytearray([
+        1, 2, 3, 255, 4, 5, 6, 255,
+        100, 100, 100, 0, 200, 200, 200, 128
+    ]))
+    frames = pattern.resample(5)
+
+    assert (frames.width, frames.height, frames.channels) == (5, 2, 3)
+    assert bytes(frames.get_row(0)) == b'\x01\x02\x03\x04\x05\x06' * 2 + b'\x01\x02\x03'
+    assert bytes(frames.get_row(1)) == b'\x00\x00\x00\x64\x64\x64' * 2 + b'\x00\x00\x00'
+    assert pattern.resample(5) is frames
+
+
+def test_write_frames_replaces(tmpdir):
+    """Test rewriting a frames file leaves existing mappings intact."""
+    from plasma.pattern import Pattern, read_frames, write_frames
+    filename = str(tmpdir.join('test.frames'))
+    write_frames(filename, Pattern(1, 1, 3, bytearray(b'\x01\x02\x03')))
+    mapped = read_frames(filename)
+
+    write_frames(filename, Pattern(2, 1, 3, bytearray(b'\x04\x05\x06\x07\x08\x09')))
+    assert bytes(mapped.get_data()) == b'\x01\x02\x03'
+    assert bytes(read_frames(filename).get_data()) == b'\x04\x05\x06\x07\x08\x09'
+    assert os.listdir(str(tmpdir)) == ['test.frames']
@@ -0,0 +1,65 @@
+"""Test pre-rendering effects to patterns."""
+import os
+
+import pytest
+
+
+def _ramp(t):
+    return bytearray([int(t * 60) % 7] * 6)
+
+
+def test_render_callable():
+    """Test a callable effect is rendered one row per frame."""
+    from plasma.render import render
+    pattern = render(_ramp, 2, 1.0, fps=10)
+
+    assert (pattern.width, pattern.height, pattern.channels) == (2, 10, 3)
+    assert bytes(pattern.get_row(1)) == b'\x06' * 6
+
+
+def test_render_numpy():
+    """Test NumPy frames of any dtype are converted to bytes."""
+    numpy = pytest.importorskip('numpy')
+    from plasma.render import render
+    pattern = render(lambda t: numpy.full((2, 3), 200), 2, 0.1, fps=10)
+    assert bytes(pattern.get_data()) == b'\xc8' * 6
+
+    pattern = render(lambda t: numpy.array([[300.0, -1.0, 127.5]]), 1, 0.1, fps=10)
+    assert bytes(pattern.get_data()) == b'\xff\x00\x7f'
+
+
+def test_render_into():
+    """Test effects with render_into fill a buffer each frame."""
+    from plasma.render import render
+
+    class Effect(object):
+        def render_into(self, buffer, delta):
+            buffer[:] = bytearray([int(delta * 10)] * len(buffer))
+
+    pattern = render(Effect(), 1, 0.5, fps=10)
+    assert bytes(pattern.get_data()) == b''.join(bytes(bytearray([x] * 3)) for x in range(5))
+
+
+def test_render_loop():
+    """Test loops are detected or marked."""
+    from plasma.render import render, find_loop
+    pattern = render(_ramp, 2, 1.0, loop=True)
+    assert pattern.height == 7
+    assert find_loop(pattern) is None
+
+    assert render(_ramp, 2, 1.0, loop=0.5).height == 30
+
+
+def test_save(tmpdir):
+    """Test rendered patterns load back through the pattern cache."""
+    pytest.importorskip('png')
+    from plasma.pattern import PatternCache
+    from plasma.render import render, save
+    pattern = render(_ramp, 2, 1.0, loop=True)
+    cache = PatternCache()
+
+    for name in ('test.png', 'test.frames'):
+        filename = str(tmpdir.join(name))
+        save(filename, pattern)
+        assert os.path.isfile(filename)
+        assert bytes(cache.load(filename).get_data()) == bytes(pattern.get_data())
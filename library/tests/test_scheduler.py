@@ -0,0 +1,41 @@
+"""Test the frame scheduler."""
+
+
+class Clock:
+    """Fake monotonic clock."""
+
+    def __init__(self):              # noqa D100
+        self.now = 100.0
+
+    def __call__(self):              # noqa D100
+        return self.now
+
+
+def test_deadlines():
+    """Test frames are scheduled at absolute times."""
+    from plasma.scheduler import FrameScheduler
+    clock = Clock()
+    scheduler = FrameScheduler(10, clock=clock)
+
+    assert scheduler.tick() == 100.0
+    clock.now += 0.03
+    assert round(scheduler.get_timeout(), 3) == 0.07
+    clock.now += 0.075
+    assert round(scheduler.tick(), 3) == 100.1
+    assert round(scheduler.get_timeout(), 3) == 0.095
+
+
+def test_skip_when_behind():
+    """Test missed frames are skipped and overruns counted."""
+    from plasma.scheduler import FrameScheduler
+    clock = Clock()
+    scheduler = FrameScheduler(10, clock=clock)
+    scheduler.tick()
+    scheduler.record(0.2, 0.05)
+    clock.now += 0.35
+
+    assert round(scheduler.tick(), 3) == 100.3
+    stats = scheduler.get_stats()
+    assert stats['skipped'] == 2
+    assert stats['overruns'] == 1
+    assert stats['frames'] == 2
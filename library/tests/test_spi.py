@@ -0,0 +1,51 @@
+"""Test the hardware SPI output backend."""
+from tools import spidev
+
+
+def test_get_device():
+    """Test SPI descriptors are parsed."""
+    from plasma import get_device
+    from plasma.spi import PlasmaSPI
+    assert get_device('SPI:0:1') == (PlasmaSPI, {'bus': 0, 'device': 1})
+    assert get_device('SPI:0:0:8000000')[1]['max_speed_hz'] == 8000000
+
+
+def test_show():
+    """Test a whole APA102 frame is sent in one transfer."""
+    from plasma.spi import PlasmaSPI
+    module = spidev()
+    plasma = PlasmaSPI(1, bus=0, device=1, spidev=module)
+    plasma.set_pixel(0, 1, 2, 3)
+    plasma.set_pixel(3, 4, 5, 6, 0)
+    plasma.show()
+
+    device = module.devices[0]
+    assert (device.bus, device.device) == (0, 1)
+    assert device.transfers == [b''.join([
+        b'\x00' * 4,
+        b'\xe3\x03\x02\x01',
+        b'\xe3\x00\x00\x00' * 2,
+        b'\xe0\x06\x05\x04',
+        b'\x00' * 5
+    ])]
+
+
+def test_set_pixel_index():
+    """Test bad indices leave the frame intact and negative ones wrap."""
+    import pytest
+    from plasma.spi import PlasmaSPI
+    module = spidev()
+    plasma = PlasmaSPI(2, spidev=module)
+    with pytest.raises(IndexError):
+        plasma.set_pixel(8, 1, 2, 3)
+    plasma.set_pixel(-1, 1, 2, 3)
+    plasma.show()
+
+    transfer = module.devices[0].transfers[-1]
+    assert len(transfer) == 4 + 8 * 4 + 5
+    assert transfer[4 + 7 * 4:4 + 8 * 4] == b'\xe3\x03\x02\x01'
+
+    plasma._mark_dirty(-2, 20)
+    plasma.set_keepalive(0)
+    plasma.show()
+    assert module.devices[0].transfers[-1] == transfer
@@ -0,0 +1,41 @@
+"""Test raw frame streaming."""
+import socket
+import time
+
+
+def _connect(path):
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(path)
+    return client
+
+
+def test_newest_frame(tmpdir):
+    """Test only the newest complete frame is returned."""
+    from plasma.stream import FrameStream
+    path = str(tmpdir.join('stream.sock'))
+    with FrameStream(path, 2) as stream:
+        client = _connect(path)
+        client.sendall(b'\x01' * 6 + b'\x02' * 6 + b'\x03' * 3)
+        time.sleep(0.01)
+        assert stream.read() == b'\x02' * 6
+
+        client.sendall(b'\x03' * 2)
+        time.sleep(0.01)
+        assert stream.read() is None
+
+        client.sendall(b'\x03')
+        time.sleep(0.01)
+        assert stream.read() == b'\x03' * 6
+        client.close()
+
+
+def test_rgba_brightness(tmpdir):
+    """Test alpha is converted to raw brightness."""
+    from plasma.stream import FrameStream
+    path = str(tmpdir.join('stream.sock'))
+    with FrameStream(path, 1, channels=4) as stream:
+        client = _connect(path)
+        client.sendall(b'\x01\x02\x03\xff')
+        time.sleep(0.01)
+        assert stream.read() == b'\x01\x02\x03\x03'
+        client.close()
@@ -0,0 +1,31 @@
+"""Test the USB serial output backend."""
+import os
+
+import pytest
+
+
+def test_show():
+    """Test the whole frame is written to the serial port."""
+    pytest.importorskip('serial')
+    from plasma.usb import PlasmaSerial
+    master, slave = os.openpty()
+    try:
+        plasma = PlasmaSerial(1, port=os.ttyname(slave), flush=False)
+        plasma.set_pixel(0, 1, 2, 3)
+        plasma.set_pixels([(4, 5, 6)], offset=3, brightness=0)
+        plasma.show()
+
+        expected = b''.join([
+            b'LEDS',
+            b'\x01\x02\x03\x03',
+            b'\x00\x00\x00\x03' * 2,
+            b'\x04\x05\x06\x00',
+            b'\x00\x00\x00\xff'
+        ])
+        received = b''
+        while len(received) < len(expected):
+            received += os.read(master, len(expected))
+        assert received == expected
+    finally:
+        os.close(master)
+        os.close(slave)
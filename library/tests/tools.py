@@ -28,3 +28,37 @@ class GPIO:
 
     def cleanup(self):               # noqa D100
         pass
+
+
+class SpiDev:
+    """Mock spidev.SpiDev class.
+
+    Records each transfer so the bytes sent can be validated.
+
+    """
+
+    def __init__(self):              # noqa D100
+        self.bus = None
+        self.device = None
+        self.max_speed_hz = 0
+        self.mode = 0
+        self.transfers = []
+
+    def open(self, bus, device):     # noqa D100
+        self.bus = bus
+        self.device = device
+
+    def writebytes2(self, data):     # noqa D100
+        self.transfers.append(bytes(data))
+
+
+class spidev:
+    """Mock spidev module."""
+
+    def __init__(self):              # noqa D100
+        self.devices = []
+
+    def SpiDev(self):                # noqa D100
+        device = SpiDev()
+        self.devices.append(device)
+        return device